@@ -17,6 +17,15 @@ FEATURE_FLAGS: Dict[str, Any] = {
     
     # Performance monitoring
     "PERFORMANCE_MONITORING": os.environ.get("PERFORMANCE_MONITORING", "false").lower() in ("true", "1", "yes"),
+    
+    # Share OpenAI narration results across workers through Redis
+    "OPENAI_RESPONSE_CACHE": os.environ.get("OPENAI_RESPONSE_CACHE", "false").lower() in ("true", "1", "yes"),
+    
+    # Serve near-duplicate content analyses from an embedding-based cache
+    "ANALYZE_SEM_CACHE": os.environ.get("ANALYZE_SEM_CACHE", "false").lower() in ("true", "1", "yes"),
+    
+    # Send async OpenAI requests over aiohttp instead of httpx (needs openai[aiohttp])
+    "OPENAI_USE_AIOHTTP": os.environ.get("OPENAI_USE_AIOHTTP", "false").lower() in ("true", "1", "yes"),
 }
 
 def is_feature_enabled(feature_name: str) -> bool:
@@ -68,7 +68,9 @@ def upload_images():
             return jsonify({"error": validation_result["error"]}), 400
             
         # Upload images to Google Cloud Storage
-        uploaded_images = image_storage_service.upload_images(files, user_id)
+        uploaded_images = image_storage_service.upload_images(
+            files, user_id, file_data=validation_result.get("file_data")
+        )
         if not uploaded_images:
             return jsonify({"error": "Failed to upload images"}), 500
             
@@ -6,7 +6,7 @@ from urllib.parse import urlparse
 import tempfile
 import traceback
 import json
-import openai
+from ..openai_client import get_openai_client
 from .pexels_fetcher import get_pexels_fetcher
 import random
 
@@ -30,11 +30,11 @@ class MediaFetcher:
             logger.error(f"Failed to create temporary directory: {e}")
             raise
 
-        # Initialize OpenAI client
-        self.openai_client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-        if not self.openai_client.api_key:
+        # Use the shared OpenAI client
+        if not os.getenv('OPENAI_API_KEY'):
             logger.error("OPENAI_API_KEY not found in environment variables")
             raise ValueError("OPENAI_API_KEY environment variable is required")
+        self.openai_client = get_openai_client()
 
     def analyze_content_type(self, content: str) -> Dict[str, float]:
         """
@@ -14,6 +14,8 @@ from ...models.video import VideoStyle, TransitionStyle
 import traceback
 import psutil
 import shutil
+import subprocess
+from moviepy.config import get_setting
 
 # Prevent truncated images
 ImageFile.LOAD_TRUNCATED_IMAGES = True
@@ -76,6 +78,9 @@ class MediaProcessor:
 
         self.target_resolution = self.RESOLUTIONS[aspect_ratio]
         self.transition_duration = transition_duration
+        
+        # Source size -> (new_width, new_height, paste_x, paste_y) for the fixed target resolution
+        self._resize_cache: Dict[Tuple[int, int], Tuple[int, int, int, int]] = {}
         logger.info(f"Initialized MediaProcessor with resolution: {self.target_resolution}, "
                    f"default transition duration: {transition_duration}s, "
                    f"temp directory: {self.temp_dir}")
@@ -120,16 +125,39 @@ class MediaProcessor:
                 transitions = [t for t in available_transitions if t != TransitionStyle.FADE]
                 return transitions[index % len(transitions)]
 
-    def _ensure_processed_images_dir(self) -> str:
-        """Ensure the processed images directory exists and return its path."""
-        processed_images_dir = os.path.join(self.temp_dir, 'processed_images')
-        try:
-            os.makedirs(processed_images_dir, exist_ok=True)
-            os.chmod(processed_images_dir, 0o777)
-            return processed_images_dir
-        except Exception as e:
-            logger.error(f"Error creating processed images directory: {str(e)}")
-            raise
+    def _get_resize_layout(self, width: int, height: int) -> Tuple[int, int, int, int]:
+        """
+        Get the resize dimensions and centered paste offsets for a source image size.
+        
+        Results are memoized per source size since the target resolution is fixed
+        for the lifetime of the processor.
+        
+        Args:
+            width: Source image width
+            height: Source image height
+            
+        Returns:
+            Tuple of (new_width, new_height, paste_x, paste_y)
+        """
+        layout = self._resize_cache.get((width, height))
+        if layout is None:
+            target_ratio = self.target_resolution[0] / self.target_resolution[1]
+            img_ratio = width / height
+            
+            if img_ratio > target_ratio:
+                # Image is wider than target ratio
+                new_width = int(self.target_resolution[1] * img_ratio)
+                new_height = self.target_resolution[1]
+            else:
+                # Image is taller than target ratio
+                new_width = self.target_resolution[0]
+                new_height = int(self.target_resolution[0] / img_ratio)
+            
+            paste_x = (self.target_resolution[0] - new_width) // 2
+            paste_y = (self.target_resolution[1] - new_height) // 2
+            layout = (new_width, new_height, paste_x, paste_y)
+            self._resize_cache[(width, height)] = layout
+        return layout
 
     def process_image(self, image_path: str, duration: float) -> ImageClip:
         """
@@ -147,13 +175,6 @@ class MediaProcessor:
             ImageClip: Processed image clip ready for video
         """
         try:
-            # Ensure the processed images directory exists
-            processed_images_dir = self._ensure_processed_images_dir()
-            
-            # Generate a unique filename for the processed image
-            filename = f"processed_{os.path.basename(image_path)}"
-            output_path = os.path.join(processed_images_dir, filename)
-            
             # Open and process image with PIL
             with Image.open(image_path) as img:
                 # Convert to RGB if necessary
@@ -161,32 +182,17 @@ class MediaProcessor:
                     img = img.convert('RGB')
                 
                 # Calculate resize dimensions maintaining aspect ratio
-                target_ratio = self.target_resolution[0] / self.target_resolution[1]
-                img_ratio = img.width / img.height
-                
-                if img_ratio > target_ratio:
-                    # Image is wider than target ratio
-                    new_width = int(self.target_resolution[1] * img_ratio)
-                    new_height = self.target_resolution[1]
-                else:
-                    # Image is taller than target ratio
-                    new_width = self.target_resolution[0]
-                    new_height = int(self.target_resolution[0] / img_ratio)
+                new_width, new_height, paste_x, paste_y = self._get_resize_layout(img.width, img.height)
                 
                 # Resize image using LANCZOS resampling
                 img = img.resize((new_width, new_height), Resampling.LANCZOS)
                 
                 # Create new image with target resolution and paste resized image in center
                 final_img = Image.new('RGB', self.target_resolution, (0, 0, 0))  # Black background
-                paste_x = (self.target_resolution[0] - new_width) // 2
-                paste_y = (self.target_resolution[1] - new_height) // 2
                 final_img.paste(img, (paste_x, paste_y))
                 
-                # Save processed image
-                final_img.save(output_path, quality=95)
-                
-                # Create video clip
-                clip = ImageClip(output_path).set_duration(duration)
+                # Create video clip directly from the frame buffer, skipping a JPEG encode/decode round-trip
+                clip = ImageClip(np.asarray(final_img)).set_duration(duration)
                 logger.info(f"Successfully processed image: {image_path}")
                 return clip
                 
@@ -376,10 +382,48 @@ class MediaProcessor:
             logger.error(f"Error creating video segments: {str(e)}")
             raise
 
+    def _mux_audio(self, video_path: str, audio_path: Optional[str], output_path: str, duration: float) -> None:
+        """
+        Mux an audio file into an already-encoded video with ffmpeg.
+        
+        The video stream is copied as-is and only the audio is encoded, so the
+        narration never has to be decoded into Python.
+        
+        Args:
+            video_path: Path to the encoded, silent video
+            audio_path: Path to the audio file, or None for a silent audio track
+            output_path: Path for the muxed output video
+            duration: Duration of the video in seconds; audio is trimmed to it
+        """
+        if audio_path is None:
+            audio_input = ['-f', 'lavfi', '-i', 'anullsrc=channel_layout=stereo:sample_rate=44100']
+        else:
+            audio_input = ['-i', audio_path]
+        command = [
+            get_setting("FFMPEG_BINARY"), '-y',
+            '-i', video_path,
+            *audio_input,
+            '-map', '0:v:0',
+            '-map', '1:a:0',
+            '-c:v', 'copy',
+            '-c:a', 'aac',
+            '-b:a', '192k',
+            '-t', f"{duration:.3f}",
+            output_path
+        ]
+        logger.info(f"Muxing audio with ffmpeg: {' '.join(command)}")
+        result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg mux failed: {result.stderr.decode(errors='replace')[-1000:]}")
+
     def combine_with_audio(self, video_clips: List[Union[ImageClip, VideoFileClip]], audio_path: str) -> Optional[str]:
         """
         Combine video clips with audio, ensuring proper synchronization and equal display times.
         
+        When the audio is a file on disk, the video is encoded without audio and the
+        file is muxed in with ffmpeg afterwards. AudioClip objects are attached with
+        moviepy directly.
+        
         Args:
             video_clips: List of video clips to combine
             audio_path: Path to the audio file or AudioClip object
@@ -393,34 +437,31 @@ class MediaProcessor:
             for i, clip in enumerate(video_clips):
                 logger.info(f"Clip {i}: Type={type(clip).__name__}, Duration={clip.duration}s, Size={clip.size if hasattr(clip, 'size') else 'N/A'}")
             
-            # Process audio
-            try:
-                if isinstance(audio_path, str):
-                    logger.info(f"Processing audio file: {audio_path}")
-                    audio_clip = self.process_audio(audio_path)
+            # Log memory usage
+            process = psutil.Process()
+            memory_info = process.memory_info()
+            logger.info(f"Memory usage before video combination: {memory_info.rss / 1024 / 1024:.2f} MB")
+            
+            # Resolve the audio source
+            audio_clip = None
+            audio_file = None
+            if isinstance(audio_path, str):
+                if os.path.isfile(audio_path) and os.path.getsize(audio_path) > 0:
+                    logger.info(f"Using audio file for ffmpeg mux: {audio_path}")
+                    audio_file = audio_path
                 else:
-                    logger.info("Using provided AudioClip object")
-                    audio_clip = audio_path  # It's already an AudioClip object
-                
-                total_audio_duration = audio_clip.duration
-                logger.info(f"Successfully processed audio with duration: {total_audio_duration}s")
-                
-                # Log memory usage
-                process = psutil.Process()
-                memory_info = process.memory_info()
-                logger.info(f"Memory usage before video combination: {memory_info.rss / 1024 / 1024:.2f} MB")
-                
-            except Exception as audio_error:
-                logger.error(f"Error processing audio file: {str(audio_error)}")
-                logger.error(f"Audio error traceback: {traceback.format_exc()}")
+                    logger.error(f"Audio file missing or empty: {audio_path}")
+            else:
+                logger.info("Using provided AudioClip object")
+                audio_clip = audio_path  # It's already an AudioClip object
+                logger.info(f"Provided audio duration: {audio_clip.duration}s")
+            
+            if audio_file is None and audio_clip is None:
                 logger.warning("Creating silent audio as fallback")
                 # Create silent audio as fallback
                 total_video_duration = sum(clip.duration for clip in video_clips)
                 audio_clip = AudioClip(lambda t: 0, duration=total_video_duration)
-                total_audio_duration = total_video_duration
-                logger.info(f"Created silent audio fallback with duration: {total_audio_duration}s")
-            
-            logger.info(f"Combining {len(video_clips)} video clips with audio (total duration: {total_audio_duration}s)")
+                logger.info(f"Created silent audio fallback with duration: {total_video_duration}s")
             
             try:
                 # IMPORTANT: Use method="compose" to preserve transitions between clips
@@ -428,10 +469,6 @@ class MediaProcessor:
                 final_video = concatenate_videoclips(video_clips, method="compose")
                 logger.info(f"Final video duration after concatenation: {final_video.duration}s")
                 
-                # Set audio
-                logger.info("Setting audio on final video")
-                final_video = final_video.set_audio(audio_clip)
-                
                 # Generate output path
                 output_path = os.path.join(self.temp_dir, "final_video.mp4")
                 logger.info(f"Output path: {output_path}")
@@ -441,18 +478,47 @@ class MediaProcessor:
                     logger.info(f"Creating output directory: {os.path.dirname(output_path)}")
                     os.makedirs(os.path.dirname(output_path), exist_ok=True)
                 
-                # Write video with high quality settings
-                logger.info("Starting video file writing with settings: fps=30, bitrate=8000k")
-                final_video.write_videofile(
-                    output_path,
-                    codec='libx264',
-                    audio_codec='aac',
-                    fps=30,
-                    bitrate='8000k',
-                    audio_bitrate='192k',
-                    threads=4,
-                    logger=None
-                )
+                if audio_file is not None:
+                    # Encode video only, then mux the audio file in with ffmpeg
+                    video_only_path = os.path.join(self.temp_dir, "video_only.mp4")
+                    try:
+                        logger.info("Starting video-only file writing with settings: fps=30, bitrate=8000k")
+                        final_video.write_videofile(
+                            video_only_path,
+                            codec='libx264',
+                            audio=False,
+                            fps=30,
+                            bitrate='8000k',
+                            threads=4,
+                            logger=None
+                        )
+                        try:
+                            self._mux_audio(video_only_path, audio_file, output_path, final_video.duration)
+                        except Exception as mux_error:
+                            # Corrupt or undecodable audio: keep the video with a silent track
+                            logger.error(f"Error muxing audio file {audio_file}: {str(mux_error)}")
+                            logger.warning("Muxing silent audio as fallback")
+                            self._mux_audio(video_only_path, None, output_path, final_video.duration)
+                    finally:
+                        if os.path.exists(video_only_path):
+                            os.remove(video_only_path)
+                else:
+                    # Set audio
+                    logger.info("Setting audio on final video")
+                    final_video = final_video.set_audio(audio_clip)
+                    
+                    # Write video with high quality settings
+                    logger.info("Starting video file writing with settings: fps=30, bitrate=8000k")
+                    final_video.write_videofile(
+                        output_path,
+                        codec='libx264',
+                        audio_codec='aac',
+                        fps=30,
+                        bitrate='8000k',
+                        audio_bitrate='192k',
+                        threads=4,
+                        logger=None
+                    )
                 
                 # Log final memory usage
                 memory_info = process.memory_info()
@@ -461,7 +527,8 @@ class MediaProcessor:
                 # Clean up
                 logger.info("Cleaning up video and audio clips")
                 final_video.close()
-                audio_clip.close()
+                if audio_clip is not None:
+                    audio_clip.close()
                 
                 logger.info(f"Successfully created video with synchronized audio: {output_path}")
                 return output_path
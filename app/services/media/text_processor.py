@@ -1,37 +1,205 @@
+import asyncio
 import logging
-import openai
-import os
+import functools
+import itertools
 import re
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple, Iterator
 import json
-import base64
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from ..openai_client import get_openai_client, get_async_openai_client, run_blocking
+from ..rate_limiter import CHARS_PER_TOKEN
+from ..response_cache import (
+    response_cache_key, get_cached_response, set_cached_response,
+    get_cached_response_async, set_cached_response_async
+)
+
+try:
+    import orjson
+    # orjson.JSONDecodeError subclasses ValueError, like json.JSONDecodeError
+    _json_loads = orjson.loads
+except ImportError:
+    # Fall back to the stdlib parser where orjson is not installed
+    _json_loads = json.loads
 
 logger = logging.getLogger(__name__)
 
+# Regex patterns for cleaning text
+HASHTAG_PATTERN = r'#\w+'  # Matches hashtags
+EMOJI_PATTERN = r'[\U0001F300-\U0001F9FF]|[\u2600-\u26FF\u2700-\u27BF]'  # Matches emojis and icons
+# Matches URLs with or without http(s) and www. Without an http(s) prefix a match may
+# only start where no word character precedes it: any match starting inside a word run
+# also matches from the run's start, so this drops no matches, but it stops
+# (?:[\w]+\.)+ from rescanning a long run from every position in it (quadratic time).
+URL_PATTERN = r'(?:https?:\/\/|(?<!\w)(?:www\.)?)(?:[\w]+\.)+[\w]+(?:\/[\w\.\-?=&%]*)*'
+
+# Compiled once at import; calling .sub on these skips the re module's pattern cache probe.
+# URLs and hashtags are removed in two passes, URLs first, as a single alternation
+# would remove "#tag.name" differently.
+_URL_RE = re.compile(URL_PATTERN)
+_HASHTAG_RE = re.compile(HASHTAG_PATTERN)
+# Deletion table for the EMOJI_PATTERN code point ranges; str.translate drops them
+# with a table lookup per character instead of a regex scan
+_EMOJI_DELETE = dict.fromkeys(
+    [*range(0x1F300, 0x1FA00), *range(0x2600, 0x2700), *range(0x2700, 0x27C0)]
+)
+_WS_RE = re.compile(r'\s+')
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Fields every content segment must carry, with their accepted types
+SEGMENT_FIELDS = {
+    'text': str,
+    'topic': str,
+    'key_points': list,
+    'duration': (int, float),
+}
+
+def _request_cache_key(request: Dict) -> str:
+    """
+    Build the response cache key for chat completion request arguments.
+    
+    Narration rewrites and segment breakdowns are sampled at temperature 0.7
+    but still cached: the same post goes through the pipeline several times
+    (previews, retries, the final render), and it should get the same narration
+    and segment timings each time rather than a new sample on every pass.
+    
+    Args:
+        request: Keyword arguments for chat.completions.create
+        
+    Returns:
+        str: Response cache key
+    """
+    system, user = (message['content'] for message in request['messages'])
+    return response_cache_key(request['model'], system, user, request['temperature'], request['max_tokens'])
+
+# ASCII whitespace other than the plain space; str.split treats all of these as separators
+_OTHER_ASCII_WS = tuple(c for c in map(chr, range(128)) if c.isspace() and c != ' ')
+
+def _count_words(text: str) -> int:
+    """
+    Count whitespace-separated words in text.
+    
+    Cleaned text is single-spaced ASCII most of the time, where the count is
+    just the number of spaces plus one and no word list is built. Anything
+    else falls back to str.split.
+    
+    Args:
+        text: Input text
+        
+    Returns:
+        int: Number of words
+    """
+    if not text:
+        return 0
+    if (text.isascii() and text[0] != ' ' and text[-1] != ' ' and '  ' not in text
+            and not any(c in text for c in _OTHER_ASCII_WS)):
+        return text.count(' ') + 1
+    return len(text.split())
+
+@functools.lru_cache(maxsize=2048)
+def _estimate_duration(text: str, rate: int = 150) -> float:
+    """
+    Estimate speech duration in seconds, memoized on (text, rate).
+    
+    Args:
+        text: Input text
+        rate: Speaking rate in words per minute
+        
+    Returns:
+        float: Estimated duration in seconds
+    """
+    word_count = _count_words(text)
+    # Calculate duration in seconds
+    return (word_count / rate) * 60
+
+@functools.lru_cache(maxsize=512)
+def _clean_text(text: str) -> str:
+    """
+    Strip non-narrative elements from text, memoized on the input string.
+    
+    The same post often passes through the pipeline several times (retries,
+    previews, final render), so repeated inputs are served from the cache.
+    Use _clean_text.cache_clear() to reset it.
+    
+    Args:
+        text: Input text to clean
+        
+    Returns:
+        str: Cleaned text
+    """
+    ws_sub = _WS_RE.sub
+    # Remove URLs, then hashtags. Every URL match needs a '.' and every hashtag
+    # a '#', so skip a regex scan when its character is absent.
+    if '.' in text:
+        text = _URL_RE.sub('', text)
+    if '#' in text:
+        text = _HASHTAG_RE.sub('', text)
+    
+    # Remove emojis and icons, which are never ASCII
+    if not text.isascii():
+        text = text.translate(_EMOJI_DELETE)
+    
+    # Clean up extra whitespace and multiple line breaks
+    return ws_sub(' ', text).strip()
+
+# Static parts of the narration system prompt; only the target duration varies per call
+_NARRATION_PROMPT_PREFIX = "You are a professional content creator. Create a concise, engaging version of the following text that will take approximately "
+_NARRATION_PROMPT_SUFFIX = """ seconds to speak naturally.
+                    
+                    Rules:
+                    1. Maintain the key message and professional tone
+                    2. Ensure the content flows naturally and ends with a complete sentence
+                    3. Do not include any hashtags, emojis, or special characters
+                    4. Make it sound natural when spoken
+                    5. Keep it concise but complete
+                    
+                    The content should be ready to be spoken as-is."""
+
+@functools.lru_cache(maxsize=128)
+def _narration_system_prompt(target_duration: float) -> str:
+    """
+    Build the narration system prompt for a target duration, memoized per duration.
+    
+    Args:
+        target_duration: Target duration in seconds
+        
+    Returns:
+        str: System prompt
+    """
+    return f"{_NARRATION_PROMPT_PREFIX}{target_duration}{_NARRATION_PROMPT_SUFFIX}"
+
 class TextProcessor:
     # Average speaking rate (words per minute)
     SPEAKING_RATE = 150  # Standard speaking pace
     
     # Regex patterns for cleaning text
-    HASHTAG_PATTERN = r'#\w+'  # Matches hashtags
-    EMOJI_PATTERN = r'[\U0001F300-\U0001F9FF]|[\u2600-\u26FF\u2700-\u27BF]'  # Matches emojis and icons
-    URL_PATTERN = r'(?:https?:\/\/|www\.)?(?:[\w]+\.)+[\w]+(?:\/[\w\.\-?=&%]*)*'  # Matches URLs with or without http(s) and www
+    HASHTAG_PATTERN = HASHTAG_PATTERN
+    EMOJI_PATTERN = EMOJI_PATTERN
+    URL_PATTERN = URL_PATTERN
+    
+    # Texts longer than this are summarized chunk by chunk before the final rewrite
+    MAP_REDUCE_WORDS = 1500
+    CHUNK_WORDS = 750
+    MAX_SUMMARY_WORKERS = 4
+    
+    # Relative deviation from the estimated total tolerated in model-assigned segment durations
+    SEGMENT_DURATION_TOLERANCE = 0.05
+    
+    # Texts up to this fraction over the target are trimmed locally instead of rewritten
+    TRUNCATE_TOLERANCE = 0.2
+    
+    # process_texts requests: at most BATCH_GROUP_SIZE texts each, BATCH_REPLY_TOKENS of
+    # reply per text, and estimated prompt plus reply tokens within BATCH_TOKEN_BUDGET,
+    # which leaves headroom in gpt-3.5-turbo's 16k-token context
+    BATCH_GROUP_SIZE = 8
+    BATCH_REPLY_TOKENS = 500
+    BATCH_TOKEN_BUDGET = 12000
     
     def __init__(self):
         """Initialize the TextProcessor service."""
-        self._openai_client = None
         logger.info("TextProcessor initialized")
 
-    @property
-    def openai_client(self):
-        """Lazy initialization of OpenAI client."""
-        if self._openai_client is None:
-            api_key = os.getenv('OPENAI_API_KEY')
-            if not api_key:
-                raise ValueError("OPENAI_API_KEY environment variable is not set")
-            self._openai_client = openai.OpenAI(api_key=api_key)
-        return self._openai_client
-
     def clean_text(self, text: str) -> str:
         """
         Clean text by removing hashtags, emojis, URLs, and other non-narrative elements.
@@ -42,31 +210,19 @@ class TextProcessor:
         Returns:
             str: Cleaned text suitable for narration
         """
-        try:
-            # Remove URLs
-            text = re.sub(self.URL_PATTERN, '', text)
-            
-            # Remove hashtags
-            text = re.sub(self.HASHTAG_PATTERN, '', text)
-            
-            # Remove emojis and icons
-            text = re.sub(self.EMOJI_PATTERN, '', text)
-            
-            # Clean up extra whitespace and multiple line breaks
-            text = re.sub(r'\s+', ' ', text)
-            text = text.strip()
-            
-            # Ensure we have some text left after cleaning
-            if not text:
-                logger.warning("Text is empty after cleaning, using original text")
-                return text.strip()
-            
-            logger.info("Text cleaned for narration: removed URLs, hashtags, and emojis")
+        if not isinstance(text, str):
+            raise TypeError(f"Expected str, got {type(text).__name__}")
+        
+        # Pure string work on str input; nothing here can fail, so no try/except
+        text = _clean_text(text)
+        
+        # Ensure we have some text left after cleaning
+        if not text:
+            logger.warning("Text is empty after cleaning, using original text")
             return text
-        except Exception as e:
-            logger.error(f"Error cleaning text: {str(e)}")
-            # Return stripped original text if cleaning fails
-            return text.strip()
+        
+        logger.info("Text cleaned for narration: removed URLs, hashtags, and emojis")
+        return text
 
     def estimate_duration(self, text: str) -> float:
         """
@@ -78,10 +234,285 @@ class TextProcessor:
         Returns:
             float: Estimated duration in seconds
         """
-        # Count words (simple split by spaces)
-        word_count = len(text.split())
-        # Calculate duration in seconds
-        return (word_count / self.SPEAKING_RATE) * 60
+        return _estimate_duration(text, self.SPEAKING_RATE)
+
+    def _chunk_text(self, text: str) -> List[str]:
+        """
+        Split text into chunks of roughly CHUNK_WORDS words on sentence boundaries.
+        
+        Args:
+            text: Input text to split
+            
+        Returns:
+            List of text chunks
+        """
+        chunks = []
+        current = []
+        current_words = 0
+        for sentence in _SENTENCE_SPLIT_RE.split(text):
+            current.append(sentence)
+            current_words += _count_words(sentence)
+            if current_words >= self.CHUNK_WORDS:
+                chunks.append(' '.join(current))
+                current = []
+                current_words = 0
+        if current:
+            chunks.append(' '.join(current))
+        return chunks
+
+    def _summarize_chunk(self, chunk: str, target_words: int) -> str:
+        """
+        Summarize one chunk of a long text to approximately target_words words.
+        
+        Args:
+            chunk: Text chunk to summarize
+            target_words: Approximate length of the summary in words
+            
+        Returns:
+            str: Summary of the chunk, or the chunk itself if summarization fails
+        """
+        try:
+            response = get_openai_client().chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=[
+                    {
+                        "role": "system",
+                        "content": f"Summarize the following part of a longer text in approximately {target_words} words. Keep the key points and professional tone. Do not include any hashtags, emojis, or special characters."
+                    },
+                    {
+                        "role": "user",
+                        "content": chunk
+                    }
+                ],
+                temperature=0.3,
+                max_tokens=500
+            )
+            summary = response.choices[0].message.content.strip()
+            return summary or chunk
+        except Exception as e:
+            logger.error(f"Error summarizing text chunk: {str(e)}")
+            return chunk
+
+    def _map_reduce_text(self, text: str, target_duration: float) -> str:
+        """
+        Condense a long text by summarizing its chunks in parallel.
+        
+        The concatenated chunk summaries are then rewritten to the target duration
+        by the regular process_text call, which acts as the merge step.
+        
+        Args:
+            text: Cleaned input text
+            target_duration: Target duration in seconds
+            
+        Returns:
+            str: Concatenated chunk summaries
+        """
+        chunks = self._chunk_text(text)
+        if len(chunks) < 2:
+            return text
+        
+        # Give each chunk a share of the final length, with headroom for the merge rewrite
+        target_words = max(50, round(2 * target_duration * self.SPEAKING_RATE / 60 / len(chunks)))
+        logger.info(f"Summarizing long text in {len(chunks)} chunks of ~{target_words} words each")
+        
+        with ThreadPoolExecutor(max_workers=min(self.MAX_SUMMARY_WORKERS, len(chunks))) as executor:
+            summaries = list(executor.map(lambda chunk: self._summarize_chunk(chunk, target_words), chunks))
+        return ' '.join(summaries)
+
+    def _truncate_to_duration(self, text: str, target_duration: float) -> Optional[str]:
+        """
+        Fit text to the target duration by dropping trailing sentences.
+        
+        Only applies when the text is at most TRUNCATE_TOLERANCE over the target;
+        larger cuts need a real summary from the model.
+        
+        Args:
+            text: Cleaned input text
+            target_duration: Target duration in seconds
+            
+        Returns:
+            Optional[str]: Trimmed text, or None if the text needs to be rewritten
+        """
+        if self.estimate_duration(text) > target_duration * (1 + self.TRUNCATE_TOLERANCE):
+            return None
+        
+        max_words = target_duration * self.SPEAKING_RATE / 60
+        kept = []
+        word_count = 0
+        for sentence in _SENTENCE_SPLIT_RE.split(text):
+            word_count += _count_words(sentence)
+            if word_count > max_words:
+                break
+            kept.append(sentence)
+        
+        # Not even the first sentence fits; leave it to the model
+        if not kept:
+            return None
+        return ' '.join(kept)
+
+    def _prepare_text(self, text: str, target_duration: float) -> str:
+        """
+        Clean text for narration and condense it first if it is very long.
+        
+        Args:
+            text: Non-empty input text
+            target_duration: Target duration in seconds
+            
+        Returns:
+            str: Text ready to be rewritten to the target duration
+        """
+        # Clean the text first
+        cleaned_text = self.clean_text(text)
+        if not cleaned_text:
+            logger.warning("Cleaned text is empty, using original text")
+            cleaned_text = text.strip()
+        
+        logger.info("Text cleaned for narration")
+        
+        # Condense long texts chunk by chunk so the final rewrite gets a short prompt
+        if _count_words(cleaned_text) > self.MAP_REDUCE_WORDS:
+            cleaned_text = self._map_reduce_text(cleaned_text, target_duration)
+        return cleaned_text
+
+    @staticmethod
+    def _narration_request(cleaned_text: str, target_duration: float) -> Dict:
+        """
+        Build the chat completion arguments for rewriting text to a target duration.
+        
+        Args:
+            cleaned_text: Cleaned input text
+            target_duration: Target duration in seconds
+            
+        Returns:
+            Dict: Keyword arguments for chat.completions.create
+        """
+        return {
+            "model": "gpt-3.5-turbo",
+            "messages": [
+                {
+                    "role": "system",
+                    "content": _narration_system_prompt(target_duration)
+                },
+                {
+                    "role": "user",
+                    "content": cleaned_text
+                }
+            ],
+            "temperature": 0.7,
+            "max_tokens": 500
+        }
+
+    def _stream_narration(self, cleaned_text: str, target_duration: float) -> Iterator[str]:
+        """
+        Stream an OpenAI rewrite of the text, yielding it one sentence at a time.
+        
+        Yielded pieces keep their trailing whitespace, so joining them reproduces
+        the full completion.
+        
+        Args:
+            cleaned_text: Cleaned input text
+            target_duration: Target duration in seconds
+            
+        Yields:
+            str: Completed sentences of the rewrite as they arrive
+        """
+        request = self._narration_request(cleaned_text, target_duration)
+        cache_key = _request_cache_key(request)
+        cached = get_cached_response(cache_key)
+        if cached:
+            logger.info("Using cached narration rewrite")
+            yield cached
+            return
+        
+        request_start = time.monotonic()
+        stream = get_openai_client().chat.completions.create(**request, stream=True)
+        
+        # The target is a soft limit; stop generating once the narration is clearly over it
+        max_words = target_duration * (1 + self.TRUNCATE_TOLERANCE) * self.SPEAKING_RATE / 60
+        word_count = 0
+        budget_reached = False
+        parts = []
+        buffer = ''
+        first_token = True
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            if first_token:
+                logger.info(f"First narration token after {time.monotonic() - request_start:.2f}s")
+                first_token = False
+            buffer += delta
+            
+            # Flush every sentence completed so far
+            start = 0
+            for boundary in _SENTENCE_SPLIT_RE.finditer(buffer):
+                sentence = buffer[start:boundary.end()]
+                start = boundary.end()
+                word_count += _count_words(sentence)
+                if parts and word_count > max_words:
+                    budget_reached = True
+                    break
+                parts.append(sentence)
+                yield sentence
+            if budget_reached:
+                break
+            buffer = buffer[start:]
+        
+        if budget_reached:
+            stream.close()
+            logger.info(f"Narration reached its duration budget, stopped streaming after {time.monotonic() - request_start:.2f}s")
+        else:
+            logger.info(f"Narration completion streamed in {time.monotonic() - request_start:.2f}s")
+            word_count += _count_words(buffer)
+            if buffer and not (parts and word_count > max_words):
+                parts.append(buffer)
+                yield buffer
+        
+        if parts:
+            set_cached_response(cache_key, ''.join(parts))
+
+    def process_text_stream(self, text: str, target_duration: float) -> Iterator[str]:
+        """
+        Process text to match target duration, yielding the narration sentence by sentence.
+        
+        Lets downstream work such as TTS start on the first sentence while the rest
+        of the completion is still being generated.
+        
+        Args:
+            text: Input text to process
+            target_duration: Target duration in seconds
+            
+        Yields:
+            str: Sentences of the processed text
+        """
+        if not text:
+            logger.error("Input text is empty")
+            return
+        
+        cleaned_text = self._prepare_text(text, target_duration)
+        truncated = self._truncate_to_duration(cleaned_text, target_duration)
+        if truncated is not None:
+            logger.info("Text fits the target duration after trimming, skipping generation")
+            yield truncated
+            return
+        
+        produced = False
+        try:
+            for sentence in self._stream_narration(cleaned_text, target_duration):
+                if sentence.strip():
+                    produced = True
+                    yield sentence
+        except Exception as e:
+            logger.error(f"OpenAI API error: {str(e)}")
+            if produced:
+                # Sentences already handed downstream cannot be taken back
+                return
+        
+        if not produced:
+            logger.warning("Using cleaned text due to empty or failed generation")
+            yield cleaned_text
 
     def process_text(self, text: str, target_duration: float) -> Optional[str]:
         """
@@ -99,42 +530,17 @@ class TextProcessor:
                 logger.error("Input text is empty")
                 return None
 
-            # Clean the text first
-            cleaned_text = self.clean_text(text)
-            if not cleaned_text:
-                logger.warning("Cleaned text is empty, using original text")
-                cleaned_text = text.strip()
+            cleaned_text = self._prepare_text(text, target_duration)
             
-            logger.info("Text cleaned for narration")
+            # Text that is already close to the target only needs trailing sentences dropped
+            truncated = self._truncate_to_duration(cleaned_text, target_duration)
+            if truncated is not None:
+                logger.info("Text fits the target duration after trimming, skipping generation")
+                return truncated
             
             # Use OpenAI to generate content that naturally fits the duration
             try:
-                response = self.openai_client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": f"""You are a professional content creator. Create a concise, engaging version of the following text that will take approximately {target_duration} seconds to speak naturally.
-                            
-                            Rules:
-                            1. Maintain the key message and professional tone
-                            2. Ensure the content flows naturally and ends with a complete sentence
-                            3. Do not include any hashtags, emojis, or special characters
-                            4. Make it sound natural when spoken
-                            5. Keep it concise but complete
-                            
-                            The content should be ready to be spoken as-is."""
-                        },
-                        {
-                            "role": "user",
-                            "content": cleaned_text
-                        }
-                    ],
-                    temperature=0.7,
-                    max_tokens=500
-                )
-                
-                processed_text = response.choices[0].message.content.strip()
+                processed_text = ''.join(self._stream_narration(cleaned_text, target_duration)).strip()
                 if not processed_text:
                     logger.warning("OpenAI returned empty text, using cleaned text")
                     return cleaned_text
@@ -152,75 +558,421 @@ class TextProcessor:
             logger.error(f"Error processing text: {str(e)}")
             return text.strip()
 
-    def analyze_content_segments(self, text: str) -> List[Dict]:
+    async def process_text_async(self, text: str, target_duration: float) -> Optional[str]:
         """
-        Analyze text to identify natural segments and their durations.
+        Async version of process_text for callers running inside an event loop.
         
         Args:
-            text: Input text to analyze
+            text: Input text to process
+            target_duration: Target duration in seconds
             
         Returns:
-            List of dictionaries containing segment text and estimated duration
+            str: Processed text that will fit within target duration
+        """
+        try:
+            if not text:
+                logger.error("Input text is empty")
+                return None
+
+            # Cleaning and map-reduce of long texts are blocking, keep them off the loop
+            cleaned_text = await run_blocking(self._prepare_text, text, target_duration)
+            
+            truncated = self._truncate_to_duration(cleaned_text, target_duration)
+            if truncated is not None:
+                logger.info("Text fits the target duration after trimming, skipping generation")
+                return truncated
+            
+            try:
+                request = self._narration_request(cleaned_text, target_duration)
+                cache_key = _request_cache_key(request)
+                processed_text = await get_cached_response_async(cache_key)
+                if processed_text:
+                    logger.info("Using cached narration rewrite")
+                else:
+                    response = await get_async_openai_client().chat.completions.create(**request)
+                    processed_text = (response.choices[0].message.content or '').strip()
+                    await set_cached_response_async(cache_key, processed_text)
+                
+                if not processed_text:
+                    logger.warning("OpenAI returned empty text, using cleaned text")
+                    return cleaned_text
+                
+                logger.info("Generated new content that naturally fits the duration")
+                return processed_text.strip()
+                
+            except Exception as e:
+                logger.error(f"OpenAI API error: {str(e)}")
+                logger.warning("Using cleaned text due to generation failure")
+                return cleaned_text
+            
+        except Exception as e:
+            logger.error(f"Error processing text: {str(e)}")
+            return text.strip()
+
+    async def process_many(self, items: List[Tuple[str, float]]) -> List[Optional[str]]:
+        """
+        Process several texts concurrently, one OpenAI request per text.
+        
+        Unlike process_texts, every text gets its own prompt, so results match
+        process_text exactly; the requests overlap instead of running back to back.
+        
+        Args:
+            items: List of (text, target_duration) tuples
+            
+        Returns:
+            List of processed texts in the same order as items
+        """
+        return list(await asyncio.gather(
+            *(self.process_text_async(text, target_duration) for text, target_duration in items)
+        ))
+
+    async def process_texts_async(self, items: List[Tuple[str, float]]) -> List[Optional[str]]:
+        """
+        Run process_texts on the OpenAI thread pool for callers inside an event loop.
+        
+        Args:
+            items: List of (text, target_duration) tuples
+            
+        Returns:
+            List of processed texts in the same order as items
+        """
+        return await run_blocking(self.process_texts, items)
+
+    def process_texts(self, items: List[Tuple[str, float]]) -> List[Optional[str]]:
+        """
+        Process several texts to their target durations with as few OpenAI calls as possible.
+        
+        Texts that only need trailing sentences dropped are trimmed locally, and very
+        long texts go through process_text to be condensed first. The rest share a
+        system prompt in grouped requests, where the model returns a JSON object
+        mapping each item's id to its narration.
+        
+        Args:
+            items: List of (text, target_duration) tuples
+            
+        Returns:
+            List of processed texts in the same order as items
+        """
+        if len(items) <= 1:
+            return [self.process_text(text, target_duration) for text, target_duration in items]
+        
+        # Empty inputs are passed through as None like process_text
+        results: List[Optional[str]] = [None] * len(items)
+        cleaned_texts: Dict[str, str] = {}
+        payload = []
+        for index, (text, target_duration) in enumerate(items):
+            if not text:
+                continue
+            cleaned_text = self.clean_text(text) or text.strip()
+            
+            # Text that is already close to the target only needs trailing sentences dropped
+            truncated = self._truncate_to_duration(cleaned_text, target_duration)
+            if truncated is not None:
+                results[index] = truncated
+            elif _count_words(cleaned_text) > self.MAP_REDUCE_WORDS:
+                results[index] = self.process_text(text, target_duration)
+            else:
+                cleaned_texts[str(index)] = cleaned_text
+                payload.append({
+                    "id": str(index),
+                    "text": cleaned_text,
+                    "target_words": max(1, round(target_duration * self.SPEAKING_RATE / 60))
+                })
+        
+        for group in self._batch_groups(payload):
+            if len(group) == 1:
+                index = int(group[0]["id"])
+                results[index] = self.process_text(*items[index])
+                continue
+            
+            narrations = self._request_batch_narrations(group)
+            for item in group:
+                narration = narrations.get(item["id"])
+                if isinstance(narration, str) and narration.strip():
+                    results[int(item["id"])] = narration.strip()
+                else:
+                    if narrations:
+                        logger.warning(f"No narration returned for batch item {item['id']}, using cleaned text")
+                    results[int(item["id"])] = cleaned_texts[item["id"]]
+        return results
+
+    def _batch_groups(self, payload: List[Dict]) -> List[List[Dict]]:
+        """
+        Split batch items into groups that fit one request.
+        
+        A group holds at most BATCH_GROUP_SIZE items, and their estimated prompt and
+        reply tokens stay within BATCH_TOKEN_BUDGET, well inside the model's context.
+        
+        Args:
+            payload: Batch items with id, text and target_words
+            
+        Returns:
+            List of item groups in order
+        """
+        groups = []
+        group = []
+        group_tokens = 0
+        for item in payload:
+            tokens = len(json.dumps(item)) // CHARS_PER_TOKEN + self.BATCH_REPLY_TOKENS
+            if group and (len(group) >= self.BATCH_GROUP_SIZE or group_tokens + tokens > self.BATCH_TOKEN_BUDGET):
+                groups.append(group)
+                group = []
+                group_tokens = 0
+            group.append(item)
+            group_tokens += tokens
+        if group:
+            groups.append(group)
+        return groups
+
+    def _request_batch_narrations(self, group: List[Dict]) -> Dict:
+        """
+        Rewrite a group of texts to their target lengths with a single OpenAI call.
+        
+        Args:
+            group: Batch items with id, text and target_words
+            
+        Returns:
+            Dict: Narrations keyed by item id, empty if the request failed
         """
         try:
-            # Use OpenAI to analyze and segment the content
-            response = self.openai_client.chat.completions.create(
+            response = get_openai_client().chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[
                     {
                         "role": "system",
-                        "content": """You are a content analyzer. Break down the following text into natural segments.
-                        For each segment, identify:
-                        1. The main topic/theme
-                        2. The key points
-                        3. The approximate speaking duration
+                        "content": """You are a professional content creator. You will receive a JSON array of texts, each with an id and a target_words count. For each one, create a concise, engaging version that is approximately target_words words long when spoken naturally.
                         
-                        Return the segments in JSON format with:
-                        - text: the segment text
-                        - topic: main topic/theme
-                        - key_points: list of key points
-                        - duration: estimated speaking duration in seconds
+                        Rules:
+                        1. Maintain the key message and professional tone
+                        2. Ensure the content flows naturally and ends with a complete sentence
+                        3. Do not include any hashtags, emojis, or special characters
+                        4. Make it sound natural when spoken
+                        5. Keep it concise but complete
                         
-                        Ensure the segments flow naturally and maintain context."""
+                        Return a JSON object mapping each id to its rewritten text, e.g. {"0": "...", "1": "..."}."""
                     },
                     {
                         "role": "user",
-                        "content": text
+                        "content": json.dumps(group)
                     }
                 ],
                 temperature=0.7,
-                max_tokens=1000
+                max_tokens=self.BATCH_REPLY_TOKENS * len(group),
+                response_format={"type": "json_object"}
             )
             
-            # Parse the response
-            segments = json.loads(response.choices[0].message.content)
+            narrations = _json_loads(response.choices[0].message.content)
+            if not isinstance(narrations, dict):
+                raise ValueError(f"Expected a JSON object, got {type(narrations).__name__}")
+            logger.info(f"Generated narration for {len(group)} texts in one request")
+            return narrations
+        except Exception as e:
+            logger.error(f"OpenAI API error in batch processing: {str(e)}")
+            logger.warning("Using cleaned texts due to generation failure")
+            return {}
+
+    @staticmethod
+    def _parse_segments(content: str) -> List[Dict]:
+        """
+        Parse and validate the segment list from a JSON-mode model reply.
+        
+        Args:
+            content: Raw message content returned by the model
             
-            # Validate and adjust durations
-            total_duration = sum(segment['duration'] for segment in segments)
-            if total_duration > 0:
-                # Normalize durations to match estimated total
-                estimated_total = self.estimate_duration(text)
-                scale_factor = estimated_total / total_duration
-                for segment in segments:
-                    segment['duration'] = round(segment['duration'] * scale_factor, 2)
+        Returns:
+            List of validated segment dictionaries
             
-            return segments
+        Raises:
+            ValueError: If the reply does not hold a well-formed segment list
+        """
+        data = _json_loads(content or '')
+        segments = data.get('segments') if isinstance(data, dict) else None
+        if not isinstance(segments, list) or not segments:
+            raise ValueError("Segment analysis response does not contain a segment list")
+        for segment in segments:
+            if not isinstance(segment, dict):
+                raise ValueError(f"Invalid segment: {segment!r}")
+            for field, field_type in SEGMENT_FIELDS.items():
+                if not isinstance(segment.get(field), field_type):
+                    raise ValueError(f"Segment field '{field}' is missing or invalid")
+        return segments
+
+    @staticmethod
+    def _segments_request(text: str, total_duration: float) -> Dict:
+        """
+        Build the chat completion arguments for breaking text into segments.
+        
+        Args:
+            text: Input text to analyze
+            total_duration: Total speaking duration the segment durations must sum to
+            
+        Returns:
+            Dict: Keyword arguments for chat.completions.create
+        """
+        return {
+            "model": "gpt-3.5-turbo",
+            "messages": [
+                {
+                    "role": "system",
+                    "content": f"""You are a content analyzer. Break down the following text into natural segments.
+                    For each segment, identify:
+                    1. The main topic/theme
+                    2. The key points
+                    3. The approximate speaking duration
+                    
+                    Return a JSON object with a "segments" array. Each segment has:
+                    - text: the segment text
+                    - topic: main topic/theme
+                    - key_points: list of key points
+                    - duration: speaking duration in seconds
+                    
+                    The segment durations must sum exactly to {total_duration:.2f} seconds.
+                    Ensure the segments flow naturally and maintain context."""
+                },
+                {
+                    "role": "user",
+                    "content": text
+                }
+            ],
+            "temperature": 0.7,
+            "max_tokens": 1000,
+            "response_format": {"type": "json_object"}
+        }
+
+    def _request_segments(self, text: str, total_duration: float) -> List[Dict]:
+        """
+        Ask OpenAI to break text into segments and parse the reply.
+        
+        Args:
+            text: Input text to analyze
+            total_duration: Total speaking duration the segment durations must sum to
+            
+        Returns:
+            List of validated segment dictionaries
+        """
+        request = self._segments_request(text, total_duration)
+        cache_key = _request_cache_key(request)
+        cached = get_cached_response(cache_key)
+        if cached:
+            logger.info("Using cached segment analysis")
+            return self._parse_segments(cached)
+        
+        response = get_openai_client().chat.completions.create(**request)
+        content = response.choices[0].message.content
+        segments = self._parse_segments(content)
+        # Only replies that parsed cleanly are cached
+        set_cached_response(cache_key, content)
+        return segments
+
+    async def _request_segments_async(self, text: str, total_duration: float) -> List[Dict]:
+        """
+        Async version of _request_segments.
+        
+        Args:
+            text: Input text to analyze
+            total_duration: Total speaking duration the segment durations must sum to
+            
+        Returns:
+            List of validated segment dictionaries
+        """
+        request = self._segments_request(text, total_duration)
+        cache_key = _request_cache_key(request)
+        cached = await get_cached_response_async(cache_key)
+        if cached:
+            logger.info("Using cached segment analysis")
+            return self._parse_segments(cached)
+        
+        response = await get_async_openai_client().chat.completions.create(**request)
+        content = response.choices[0].message.content
+        segments = self._parse_segments(content)
+        await set_cached_response_async(cache_key, content)
+        return segments
+
+    def _rescale_segments(self, segments: List[Dict], estimated_total: float) -> List[Dict]:
+        """
+        Rescale segment durations when the model missed the requested total.
+        
+        Args:
+            segments: Validated segments
+            estimated_total: Expected total duration in seconds
+            
+        Returns:
+            List of segments with sane durations
+        """
+        total_duration = sum(segment['duration'] for segment in segments)
+        if total_duration > 0 and abs(total_duration - estimated_total) > estimated_total * self.SEGMENT_DURATION_TOLERANCE:
+            logger.warning(f"Segment durations sum to {total_duration:.2f}s, expected {estimated_total:.2f}s; rescaling")
+            scale_factor = estimated_total / total_duration
+            durations = np.fromiter((segment['duration'] for segment in segments), dtype=np.float64, count=len(segments))
+            durations = np.round(durations * scale_factor, 2)
+            for segment, duration in zip(segments, durations.tolist()):
+                segment['duration'] = duration
+        return segments
+
+    def _fallback_segments(self, text: str) -> List[Dict]:
+        """
+        Split text into sentence segments without calling OpenAI.
+        
+        Args:
+            text: Input text to split
+            
+        Returns:
+            List of segments with estimated durations
+        """
+        return [
+            {
+                'text': sentence,
+                'topic': 'General',
+                'key_points': [sentence],
+                'duration': self.estimate_duration(sentence)
+            }
+            for sentence in map(str.strip, _SENTENCE_SPLIT_RE.split(text))
+            if sentence
+        ]
+
+    def analyze_content_segments(self, text: str) -> List[Dict]:
+        """
+        Analyze text to identify natural segments and their durations.
+        
+        Args:
+            text: Input text to analyze
+            
+        Returns:
+            List of dictionaries containing segment text and estimated duration
+        """
+        try:
+            # Use OpenAI to analyze and segment the content; the model is asked for
+            # durations that already sum to the estimated total
+            estimated_total = self.estimate_duration(text)
+            segments = self._request_segments(text, estimated_total)
+            
+            # Sanity check: only rescale when the model missed the requested total
+            return self._rescale_segments(segments, estimated_total)
             
         except Exception as e:
             logger.error(f"Error analyzing content segments: {str(e)}")
             # Fallback: split text into sentences and estimate duration for each
-            sentences = text.split('.')
-            segments = []
-            for sentence in sentences:
-                if sentence.strip():
-                    duration = self.estimate_duration(sentence)
-                    segments.append({
-                        'text': sentence.strip(),
-                        'topic': 'General',
-                        'key_points': [sentence.strip()],
-                        'duration': duration
-                    })
-            return segments
+            return self._fallback_segments(text)
+
+    async def analyze_content_segments_async(self, text: str) -> List[Dict]:
+        """
+        Async version of analyze_content_segments, so several texts can be segmented concurrently.
+        
+        Args:
+            text: Input text to analyze
+            
+        Returns:
+            List of dictionaries containing segment text and estimated duration
+        """
+        try:
+            estimated_total = self.estimate_duration(text)
+            segments = await self._request_segments_async(text, estimated_total)
+            
+            return self._rescale_segments(segments, estimated_total)
+            
+        except Exception as e:
+            logger.error(f"Error analyzing content segments: {str(e)}")
+            return self._fallback_segments(text)
 
     def match_images_to_segments(self, segments: List[Dict], image_paths: List[str]) -> List[Dict]:
         """
@@ -234,10 +986,13 @@ class TextProcessor:
             List of segments with matched images
         """
         try:
+            if not image_paths:
+                raise ValueError("No images to match")
+            
             matched_segments = []
-            for i, segment in enumerate(segments):
-                # Assign images sequentially, cycling through available images
-                segment['image_path'] = image_paths[i % len(image_paths)]
+            # Assign images sequentially, cycling through available images
+            for segment, image_path in zip(segments, itertools.cycle(image_paths)):
+                segment['image_path'] = image_path
                 matched_segments.append(segment)
             
             return matched_segments
@@ -1,32 +1,237 @@
-from typing import Dict, Optional, List
+from typing import Dict, Iterator, Optional, List, Tuple, Union
 import os
+import asyncio
+import json
 import logging
-from openai import OpenAI, APIError
-from tenacity import retry, stop_after_attempt, wait_exponential
-from datetime import datetime
-import nltk
-from nltk.tokenize import word_tokenize, RegexpTokenizer
-from nltk.corpus import stopwords
-from string import punctuation
+import functools
+from collections import Counter
+from datetime import datetime, timezone
 import re
+import random
+import time
 import traceback
+from contextvars import ContextVar
 import sentry_sdk
 
+from .openai_client import get_openai_client, get_async_openai_client, run_blocking
+from .response_cache import response_cache_key, get_cached_response, set_cached_response, get_cached_response_async
+from .semantic_cache import SemanticCache, EMBEDDING_MODEL
+from .rate_limiter import RateLimiter, estimate_request_tokens, retry_after_seconds
+from ..config import is_feature_enabled
+
+try:
+    import orjson
+    # orjson.JSONDecodeError subclasses ValueError, like json.JSONDecodeError
+    _json_loads = orjson.loads
+except ImportError:
+    # Fall back to the stdlib parser where orjson is not installed
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
-# Define a custom tokenizer as fallback
-FALLBACK_TOKENIZER = RegexpTokenizer(r'\w+|\$[\d\.]+|\S+')
+# Attempts per generate_post API call before giving up
+GENERATE_POST_ATTEMPTS = 3
 
-# Module-level flag for punkt_tab availability
-PUNKT_TAB_AVAILABLE = False
+# Client-side limits for async requests, set to the account's OpenAI rate limits
+OPENAI_MAX_REQUESTS_PER_MINUTE = int(os.getenv('OPENAI_MAX_REQUESTS_PER_MINUTE', '500'))
+OPENAI_MAX_TOKENS_PER_MINUTE = int(os.getenv('OPENAI_MAX_TOKENS_PER_MINUTE', '200000'))
 
-try:
-    nltk.data.find('tokenizers/punkt')
-    PUNKT_TAB_AVAILABLE = True
-    logger.info("NLTK punkt tokenizer is available")
-except LookupError:
-    logger.warning("NLTK punkt tokenizer not found, will use fallback tokenizer")
-    PUNKT_TAB_AVAILABLE = False
+# Fraction of analysis calls whose info-level Sentry breadcrumbs are recorded
+BREADCRUMB_SAMPLE_RATE = float(os.getenv('SENTRY_BREADCRUMB_SAMPLE', '0.05'))
+
+# Whether the analysis call in progress keeps its info breadcrumbs, drawn once per call
+_breadcrumbs_sampled: ContextVar[bool] = ContextVar("breadcrumbs_sampled", default=False)
+
+# Async completions in flight at once per service, whatever the caller
+OPENAI_MAX_CONCURRENCY = int(os.getenv('OPENAI_MAX_CONCURRENCY', '32'))
+
+# Posts generated at once by generate_posts_batch
+BATCH_MAX_CONCURRENCY = int(os.getenv('OPENAI_BATCH_CONCURRENCY', '8'))
+
+# Batch API polling for analyze_content_batch: starts at 5s, doubling to a 5 minute cap
+BATCH_POLL_INITIAL_DELAY = 5.0  # seconds
+BATCH_POLL_MAX_DELAY = 300.0  # seconds
+BATCH_TERMINAL_STATUSES = frozenset(['completed', 'failed', 'expired', 'cancelled'])
+
+# Posts analyzed per chat completion by analyze_contents, each allowed 500 output tokens
+ANALYZE_GROUP_SIZE = 8
+
+# Static part of the generate_post prompt. It comes before the per-request fields so
+# the start of every request is identical, which OpenAI's prompt cache can reuse.
+POST_PROMPT_GUIDELINES = """Generate a LinkedIn post on the theme below.
+            
+            Guidelines:
+            - Make it engaging and thought-provoking for the target audience
+            - Include relevant hashtags
+            - Focus on professional insights and experiences
+            - Maintain the specified tone throughout
+            - End with a call to action or question when appropriate
+            
+            Format the post ready for LinkedIn, including line breaks where appropriate.
+            """
+
+# Word, dollar amount or single non-space character, like NLTK's word_tokenize
+TOKEN_RE = re.compile(r'\w+|\$[\d\.]+|\S+')
+
+# Keyword candidates for analyze_content: alphanumeric runs of four or more characters
+KEYWORD_TOKEN_RE = re.compile(r'[^\W_]{4,}')
+
+# NLTK's English stopword list, kept here so analysis needs no corpus download
+STOP_WORDS = frozenset([
+    'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', "you're", "you've",
+    "you'll", "you'd", 'your', 'yours', 'yourself', 'yourselves', 'he', 'him', 'his', 'himself',
+    'she', "she's", 'her', 'hers', 'herself', 'it', "it's", 'its', 'itself', 'they', 'them',
+    'their', 'theirs', 'themselves', 'what', 'which', 'who', 'whom', 'this', 'that', "that'll",
+    'these', 'those', 'am', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has',
+    'had', 'having', 'do', 'does', 'did', 'doing', 'a', 'an', 'the', 'and', 'but', 'if', 'or',
+    'because', 'as', 'until', 'while', 'of', 'at', 'by', 'for', 'with', 'about', 'against',
+    'between', 'into', 'through', 'during', 'before', 'after', 'above', 'below', 'to', 'from',
+    'up', 'down', 'in', 'out', 'on', 'off', 'over', 'under', 'again', 'further', 'then', 'once',
+    'here', 'there', 'when', 'where', 'why', 'how', 'all', 'any', 'both', 'each', 'few', 'more',
+    'most', 'other', 'some', 'such', 'no', 'nor', 'not', 'only', 'own', 'same', 'so', 'than',
+    'too', 'very', 's', 't', 'can', 'will', 'just', 'don', "don't", 'should', "should've", 'now',
+    'd', 'll', 'm', 'o', 're', 've', 'y', 'ain', 'aren', "aren't", 'couldn', "couldn't", 'didn',
+    "didn't", 'doesn', "doesn't", 'hadn', "hadn't", 'hasn', "hasn't", 'haven', "haven't", 'isn',
+    "isn't", 'ma', 'mightn', "mightn't", 'mustn', "mustn't", 'needn', "needn't", 'shan', "shan't",
+    'shouldn', "shouldn't", 'wasn', "wasn't", 'weren', "weren't", 'won', "won't", 'wouldn',
+    "wouldn't"
+])
+
+@functools.lru_cache(maxsize=512)
+def _tokenize_cached(text: str) -> Tuple[str, ...]:
+    """Tokenize lowercased text, cached because the same post is often analyzed repeatedly."""
+    return tuple(TOKEN_RE.findall(text.lower()))
+
+def _crumb(category: str, message: str, level: str = "info") -> None:
+    """
+    Add a Sentry breadcrumb, sampling the routine ones.
+    
+    Info breadcrumbs are kept only inside a call sampled by sample_breadcrumbs,
+    so a call's trail is recorded whole or not at all; warnings and errors are
+    always kept.
+    
+    Args:
+        category (str): Breadcrumb category
+        message (str): Breadcrumb message
+        level (str): Breadcrumb level
+    """
+    if level in ("warning", "error") or _breadcrumbs_sampled.get():
+        sentry_sdk.add_breadcrumb(category=category, message=message, level=level)
+
+def sample_breadcrumbs(func):
+    """
+    Decide once per call whether a service method keeps its info breadcrumbs.
+    
+    A SENTRY_BREADCRUMB_SAMPLE fraction of calls is sampled. Works on both sync
+    and async methods.
+    
+    Args:
+        func: The method to wrap
+        
+    Returns:
+        The wrapped method
+    """
+    if asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            token = _breadcrumbs_sampled.set(random.random() < BREADCRUMB_SAMPLE_RATE)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                _breadcrumbs_sampled.reset(token)
+        return async_wrapper
+    
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _breadcrumbs_sampled.set(random.random() < BREADCRUMB_SAMPLE_RATE)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _breadcrumbs_sampled.reset(token)
+    return wrapper
+
+def _retryable_errors() -> Tuple[type, ...]:
+    """OpenAI errors worth retrying; 4xx errors other than rate limits would fail again."""
+    from openai import APIConnectionError, InternalServerError, RateLimitError
+    # APITimeoutError is a subclass of APIConnectionError
+    return (RateLimitError, APIConnectionError, InternalServerError)
+
+def _retry_delay(attempt: int) -> float:
+    """Backoff before retrying a failed completion: 4s doubling to a 10s cap, plus jitter."""
+    return min(10, 4 * 2 ** attempt) + random.uniform(0, 1)
+
+def _error_response(e: Exception, operation: str, report: bool = False) -> Dict:
+    """
+    Log a failed operation and build the error response returned to callers.
+    
+    Args:
+        e (Exception): The error raised
+        operation (str): What was being done, e.g. "post generation"
+        report (bool): Whether to also report the error to Sentry
+        
+    Returns:
+        Dict: Error response
+    """
+    from openai import APIError
+    
+    if isinstance(e, APIError):
+        logger.error(f"OpenAI API error during {operation}: {str(e)}")
+        if report:
+            sentry_sdk.capture_exception(e)
+            sentry_sdk.set_context("api_error", {
+                "message": str(e),
+                "type": "api_error"
+            })
+        return {
+            "success": False,
+            "error": f"OpenAI API error: {str(e)}"
+        }
+    
+    logger.error(f"Unexpected error in {operation}: {str(e)}")
+    if report:
+        logger.error(traceback.format_exc())
+        sentry_sdk.capture_exception(e)
+        sentry_sdk.set_context("error_details", {
+            "message": str(e),
+            "type": type(e).__name__,
+            "traceback": traceback.format_exc()
+        })
+    return {
+        "success": False,
+        "error": f"Unexpected error in {operation}: {str(e)}"
+    }
+
+def safe_call(operation: str, report: bool = False):
+    """
+    Turn exceptions raised by a service method into an error response.
+    
+    Works on both sync and async methods.
+    
+    Args:
+        operation (str): What the method does, used in log and error messages
+        report (bool): Whether to also report errors to Sentry
+        
+    Returns:
+        Decorator for the method
+    """
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as e:
+                    return _error_response(e, operation, report)
+            return async_wrapper
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                return _error_response(e, operation, report)
+        return wrapper
+    return decorator
 
 class OpenAIService:
     def __init__(self):
@@ -40,152 +245,287 @@ class OpenAIService:
             logger.error("OPENAI_API_KEY environment variable is not set")
             raise ValueError("OPENAI_API_KEY environment variable is not set")
             
-        self.client = OpenAI(api_key=api_key)
         self.model = "gpt-3.5-turbo"  # Using GPT-3.5 Turbo model
+        # Embedding-based cache for analyze_content, only allocated when enabled
+        self.analysis_cache = SemanticCache() if is_feature_enabled("ANALYZE_SEM_CACHE") else None
+        # Throttles async requests before they reach the API's rate limits
+        self.rate_limiter = RateLimiter(OPENAI_MAX_REQUESTS_PER_MINUTE, OPENAI_MAX_TOKENS_PER_MINUTE)
+        # One per event loop, since a semaphore can only be awaited from the loop that first uses it
+        self._concurrency_sems: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
         logger.info("OpenAI service initialized successfully")
+
+    @functools.cached_property
+    def client(self):
+        """Shared OpenAI client, created on first API call rather than at service startup."""
+        return get_openai_client()
+
+    @functools.cached_property
+    def _completion_client(self):
+        """Shared client with SDK retries off, for calls retried by _create_completion."""
+        return self.client.with_options(max_retries=0)
+
+    def tokenize_text(self, text):
+        """
+        Split lowercased text into word and punctuation tokens.
         
-        # Setup fallback tokenizer flag
-        self.use_fallback_tokenizer = False
+        Args:
+            text (str): The text to tokenize
+            
+        Returns:
+            list: List of tokens
+        """
+        return list(_tokenize_cached(text))
+
+    def _embed(self, text: str) -> Optional[List[float]]:
+        """
+        Embed text for the semantic analysis cache.
         
-        # Initialize NLTK resources if needed for content analysis
+        Args:
+            text (str): Text to embed
+            
+        Returns:
+            Optional[List[float]]: Embedding vector, or None if the request failed
+        """
         try:
-            sentry_sdk.add_breadcrumb(
-                category="nltk",
-                message="Checking NLTK resources",
-                level="info"
-            )
+            response = self.client.embeddings.create(model=EMBEDDING_MODEL, input=text)
+            return response.data[0].embedding
+        except Exception as e:
+            logger.warning(f"Embedding request failed, skipping semantic cache: {str(e)}")
+            return None
+
+    async def _embed_async(self, text: str) -> Optional[List[float]]:
+        """
+        Embed text for the semantic analysis cache without blocking the event loop.
+        
+        Args:
+            text (str): Text to embed
+            
+        Returns:
+            Optional[List[float]]: Embedding vector, or None if the request failed
+        """
+        try:
+            response = await get_async_openai_client().embeddings.create(model=EMBEDDING_MODEL, input=text)
+            return response.data[0].embedding
+        except Exception as e:
+            logger.warning(f"Embedding request failed, skipping semantic cache: {str(e)}")
+            return None
+
+    def _concurrency_semaphore(self) -> asyncio.Semaphore:
+        """
+        Return the semaphore limiting in-flight async completions in the running event loop.
+        
+        Semaphores of closed loops are dropped whenever a new one is created.
+        
+        Returns:
+            asyncio.Semaphore: Semaphore with OPENAI_MAX_CONCURRENCY slots
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._concurrency_sems.get(loop)
+        if semaphore is None:
+            for closed_loop in [other for other in self._concurrency_sems if other.is_closed()]:
+                del self._concurrency_sems[closed_loop]
+            semaphore = self._concurrency_sems[loop] = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+        return semaphore
+
+    def _create_completion(self, **request):
+        """
+        Call the chat completions API, retrying transient errors with exponential backoff.
+        
+        Rate limits, connection errors, timeouts and 5xx responses are retried up to
+        GENERATE_POST_ATTEMPTS times in total; other API errors are raised at once.
+        The SDK's own retries are turned off so attempts don't multiply.
+        
+        Args:
+            **request: Keyword arguments for chat.completions.create
+            
+        Returns:
+            The chat completion response
             
-            # Try to find punkt and stopwords
+        Raises:
+            APIError: If the error is not transient or every attempt fails
+        """
+        client = self._completion_client
+        retryable = _retryable_errors()
+        for attempt in range(GENERATE_POST_ATTEMPTS):
             try:
-                nltk.data.find('tokenizers/punkt')
-                logger.info("Found NLTK punkt resource")
-                
-                # Check specifically for punkt_tab resource
-                try:
-                    nltk.data.find('tokenizers/punkt/punkt_tab')
-                    logger.info("Found NLTK punkt_tab resource")
-                    sentry_sdk.add_breadcrumb(
-                        category="nltk",
-                        message="punkt_tab resource found",
-                        level="info"
-                    )
-                except LookupError as e:
-                    logger.warning(f"punkt_tab resource not found: {e}")
-                    sentry_sdk.add_breadcrumb(
-                        category="nltk",
-                        message=f"punkt_tab resource not found: {e}",
-                        level="warning"
-                    )
-                    self.use_fallback_tokenizer = True
-            except LookupError:
-                logger.warning("punkt resource not found")
-                self.use_fallback_tokenizer = True
+                return client.chat.completions.create(**request)
+            except retryable as e:
+                if attempt == GENERATE_POST_ATTEMPTS - 1:
+                    raise
+                delay = _retry_delay(attempt)
+                logger.warning(f"OpenAI API error on attempt {attempt + 1}, retrying in {delay:.1f}s: {str(e)}")
+                time.sleep(delay)
+
+    async def _create_completion_async(self, **request):
+        """
+        Async version of _create_completion using the shared AsyncOpenAI client.
+        
+        Each attempt first waits for room under the client-side rate limits, and at
+        most OPENAI_MAX_CONCURRENCY requests are in flight at once. A rate limit
+        error pauses all async requests for the time the API asks for; other
+        transient errors are retried with backoff and the rest raised at once.
+        
+        Args:
+            **request: Keyword arguments for chat.completions.create
             
+        Returns:
+            The chat completion response
+            
+        Raises:
+            APIError: If the error is not transient or every attempt fails
+        """
+        from openai import RateLimitError
+        
+        client = get_async_openai_client().with_options(max_retries=0)
+        retryable = _retryable_errors()
+        tokens = estimate_request_tokens(request)
+        for attempt in range(GENERATE_POST_ATTEMPTS):
+            await self.rate_limiter.acquire(tokens)
             try:
-                nltk.data.find('corpora/stopwords')
-                logger.info("Found NLTK stopwords resource")
-            except LookupError:
-                logger.warning("stopwords resource not found")
-                
-            # Download resources if not found
-            if self.use_fallback_tokenizer:
-                logger.info("Downloading NLTK resources")
-                sentry_sdk.add_breadcrumb(
-                    category="nltk",
-                    message="Downloading NLTK resources",
-                    level="info"
-                )
-                
-                try:
-                    # First try punkt_tab directly (for NLTK 3.8.2+)
-                    nltk.download('punkt_tab')
-                    self.use_fallback_tokenizer = False
-                    sentry_sdk.add_breadcrumb(
-                        category="nltk",
-                        message="Downloaded punkt_tab",
-                        level="info"
-                    )
-                except Exception as e:
-                    logger.warning(f"Failed to download punkt_tab: {e}")
-                    sentry_sdk.add_breadcrumb(
-                        category="nltk",
-                        message=f"Failed to download punkt_tab: {e}",
-                        level="warning"
-                    )
-                    
-                    # Fall back to punkt (for older NLTK versions)
-                    try:
-                        nltk.download('punkt')
-                        logger.info("Downloaded punkt")
-                        
-                        # Check if punkt_tab is now available
-                        try:
-                            nltk.data.find('tokenizers/punkt/punkt_tab')
-                            self.use_fallback_tokenizer = False
-                            logger.info("punkt_tab is now available after punkt download")
-                        except LookupError:
-                            logger.warning("punkt_tab still not available after punkt download")
-                            self.use_fallback_tokenizer = True
-                    except Exception as e:
-                        logger.warning(f"Failed to download punkt: {e}")
-                        self.use_fallback_tokenizer = True
-                
-                nltk.download('stopwords')
-        except Exception as e:
-            logger.error(f"Error initializing NLTK resources: {e}")
-            self.use_fallback_tokenizer = True
-            sentry_sdk.capture_exception(e)
-            sentry_sdk.add_breadcrumb(
-                category="nltk",
-                message=f"Error initializing NLTK resources: {e}",
-                level="error"
-            )
+                async with self._concurrency_semaphore():
+                    return await client.chat.completions.create(**request)
+            except RateLimitError as e:
+                if attempt == GENERATE_POST_ATTEMPTS - 1:
+                    raise
+                # The next acquire waits out the pause
+                self.rate_limiter.pause(retry_after_seconds(e) or _retry_delay(attempt))
+            except retryable as e:
+                if attempt == GENERATE_POST_ATTEMPTS - 1:
+                    raise
+                delay = _retry_delay(attempt)
+                logger.warning(f"OpenAI API error on attempt {attempt + 1}, retrying in {delay:.1f}s: {str(e)}")
+                await asyncio.sleep(delay)
+
+    def _post_request(self, theme: str, tone: str, target_audience: str, length: int) -> Dict:
+        """
+        Build the chat completion arguments for a post.
         
-        # Log final state
-        if self.use_fallback_tokenizer:
-            logger.info("Using fallback tokenizer")
-            sentry_sdk.set_tag("nltk.tokenizer", "fallback")
-        else:
-            logger.info("Using NLTK tokenizer")
-            sentry_sdk.set_tag("nltk.tokenizer", "nltk")
+        Posts are sampled at temperature 0.7 so repeated requests get different
+        posts, which is why they are not put in the response cache.
+        
+        Args:
+            theme (str): The post theme
+            tone (str): The desired tone
+            target_audience (str): Target audience for the post
+            length (int): Desired character length
+            
+        Returns:
+            Dict: Keyword arguments for chat.completions.create
+        """
+        # Create prompt for GPT: fixed instructions first, so every request shares the prefix
+        prompt = f"""{POST_PROMPT_GUIDELINES}
+            Theme: {theme}
+            Tone: {tone}
+            Target Audience: {target_audience}
+            Length: Approximately {length} characters"""
 
-    def tokenize_text(self, text):
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": self.system_instructions},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.7,
+            "max_tokens": 800,
+            "top_p": 1.0,
+            "frequency_penalty": 0.5,
+            "presence_penalty": 0.3
+        }
+
+    @staticmethod
+    def _post_response(content: str, theme: str, tone: str, target_audience: str, length: int, include_video: bool) -> Dict:
         """
-        Tokenize text using NLTK if available, otherwise use a simple fallback tokenizer.
+        Wrap generated post content in the response returned to callers.
         
         Args:
-            text (str): The text to tokenize
+            content (str): Generated post content
+            theme (str): The post theme
+            tone (str): The desired tone
+            target_audience (str): Target audience for the post
+            length (int): Desired character length
+            include_video (bool): Whether to include video suggestions
             
         Returns:
-            list: List of tokens
+            Dict: Generated post content and metadata
         """
-        # Use fallback tokenizer if determined necessary during init
-        if self.use_fallback_tokenizer:
-            return FALLBACK_TOKENIZER.tokenize(text.lower())
+        response_data = {
+            "success": True,
+            "data": {
+                "content": content,
+                "metadata": {
+                    "theme": theme,
+                    "tone": tone,
+                    "targetAudience": target_audience,
+                    "length": length,
+                    "characterCount": len(content),
+                    "includeVideo": include_video,
+                    "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds")
+                }
+            }
+        }
+
+        # If video is requested, add placeholder for video suggestion
+        if include_video:
+            response_data["data"]["videoSuggestion"] = {
+                "type": "placeholder",
+                "message": "Video generation will be implemented in a future update"
+            }
+
+        return response_data
+
+    @staticmethod
+    def _truncate_post(content: str, max_chars: int) -> str:
+        """
+        Cut a post to at most max_chars characters, ending on a whole word where possible.
         
-        # Try NLTK tokenization, with fallback if it fails
-        try:
-            return word_tokenize(text.lower())
-        except LookupError as e:
-            logger.warning(f"NLTK tokenization error: {e}")
-            sentry_sdk.capture_message(f"NLTK tokenization error: {e}")
+        Args:
+            content (str): Post content
+            max_chars (int): Maximum character count
             
-            # Update state for future calls
-            self.use_fallback_tokenizer = True
-            sentry_sdk.set_tag("nltk.tokenizer", "fallback")
+        Returns:
+            str: Truncated post content
+        """
+        if len(content) <= max_chars:
+            return content
+        truncated = content[:max_chars]
+        if not content[max_chars].isspace() and ' ' in truncated:
+            truncated = truncated.rsplit(' ', 1)[0]
+        return truncated.rstrip()
+
+    def _stream_post(self, request: Dict, max_chars: int) -> str:
+        """
+        Stream a post and stop generating once it reaches max_chars.
+        
+        Args:
+            request (Dict): Keyword arguments for chat.completions.create
+            max_chars (int): Maximum character count
             
-            # Use fallback tokenizer
-            return FALLBACK_TOKENIZER.tokenize(text.lower())
-        except Exception as e:
-            logger.warning(f"Unexpected tokenization error: {e}")
-            return FALLBACK_TOKENIZER.tokenize(text.lower())
+        Returns:
+            str: Post content, at most max_chars characters
+        """
+        stream = self._create_completion(**request, stream=True)
+        parts = []
+        length = 0
+        try:
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                parts.append(delta)
+                length += len(delta)
+                if length > max_chars:
+                    # Closing the stream stops generation, so the extra tokens are not billed
+                    logger.info(f"Post reached {max_chars} characters, stopping generation")
+                    return self._truncate_post(''.join(parts).strip(), max_chars)
+        finally:
+            stream.close()
+        return ''.join(parts).strip()
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry_error_callback=lambda retry_state: None
-    )
-    def generate_post(self, theme: str, tone: str, target_audience: str, length: int, include_video: bool = False) -> Dict:
+    @safe_call("post generation")
+    def generate_post(self, theme: str, tone: str, target_audience: str, length: int, include_video: bool = False,
+                      max_chars: Optional[int] = None) -> Dict:
         """
         Generate a LinkedIn post using OpenAI's GPT model.
         
@@ -195,84 +535,107 @@ class OpenAIService:
             target_audience (str): Target audience for the post
             length (int): Desired character length
             include_video (bool): Whether to include video suggestions
+            max_chars (Optional[int]): Hard cap on the post length; generation is streamed
+                and stopped once the post reaches it
             
         Returns:
             Dict: Generated post content and metadata
+        """
+        request = self._post_request(theme, tone, target_audience, length)
+        if max_chars:
+            content = self._stream_post(request, max_chars)
+        else:
+            # Make API call
+            response = self._create_completion(**request)
+
+            # Extract generated content
+            content = response.choices[0].message.content.strip()
+
+        return self._post_response(content, theme, tone, target_audience, length, include_video)
+
+    def generate_post_stream(self, theme: str, tone: str, target_audience: str, length: int,
+                             include_video: bool = False) -> Iterator[Union[str, Dict]]:
+        """
+        Generate a LinkedIn post, yielding the text as the model produces it.
+        
+        Lets an interactive caller show the first words after a fraction of a second
+        instead of waiting for the whole completion.
+        
+        Args:
+            theme (str): The post theme (e.g., "Leadership & Management")
+            tone (str): The desired tone (e.g., "Professional")
+            target_audience (str): Target audience for the post
+            length (int): Desired character length
+            include_video (bool): Whether to include video suggestions
             
-        Raises:
-            APIError: If OpenAI API call fails
+        Yields:
+            Union[str, Dict]: Pieces of the post, then the same response dict generate_post
+                returns (or its error response) as the last item
         """
         try:
-            # Create prompt for GPT
-            prompt = f"""Generate a LinkedIn post about {theme}.
-            Tone: {tone}
-            Target Audience: {target_audience}
-            Length: Approximately {length} characters
-            
-            Guidelines:
-            - Make it engaging and thought-provoking for {target_audience}
-            - Include relevant hashtags
-            - Focus on professional insights and experiences
-            - Maintain the specified tone throughout
-            - End with a call to action or question when appropriate
+            request = self._post_request(theme, tone, target_audience, length)
+            stream = self._create_completion(**request, stream=True)
+            parts = []
+            try:
+                for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        parts.append(delta)
+                        yield delta
+            finally:
+                stream.close()
+            content = ''.join(parts).strip()
             
-            Format the post ready for LinkedIn, including line breaks where appropriate."""
+            yield self._post_response(content, theme, tone, target_audience, length, include_video)
+        except Exception as e:
+            yield _error_response(e, "post generation")
 
-            # Make API call
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": self.system_instructions},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=800,
-                top_p=1.0,
-                frequency_penalty=0.5,
-                presence_penalty=0.3
-            )
+    @safe_call("post generation")
+    async def generate_post_async(self, theme: str, tone: str, target_audience: str, length: int, include_video: bool = False) -> Dict:
+        """
+        Async version of generate_post.
+        
+        Several posts can be generated concurrently with asyncio.gather, so the
+        total wait is roughly that of the slowest request.
+        
+        Args:
+            theme (str): The post theme (e.g., "Leadership & Management")
+            tone (str): The desired tone (e.g., "Professional")
+            target_audience (str): Target audience for the post
+            length (int): Desired character length
+            include_video (bool): Whether to include video suggestions
+            
+        Returns:
+            Dict: Generated post content and metadata
+        """
+        request = self._post_request(theme, tone, target_audience, length)
+        response = await self._create_completion_async(**request)
+        content = response.choices[0].message.content.strip()
 
-            # Extract generated content
-            content = response.choices[0].message.content.strip()
-            char_count = len(content)
-
-            response_data = {
-                "success": True,
-                "data": {
-                    "content": content,
-                    "metadata": {
-                        "theme": theme,
-                        "tone": tone,
-                        "targetAudience": target_audience,
-                        "length": length,
-                        "characterCount": char_count,
-                        "includeVideo": include_video,
-                        "timestamp": datetime.utcnow().isoformat()
-                    }
-                }
-            }
+        return self._post_response(content, theme, tone, target_audience, length, include_video)
 
-            # If video is requested, add placeholder for video suggestion
-            if include_video:
-                response_data["data"]["videoSuggestion"] = {
-                    "type": "placeholder",
-                    "message": "Video generation will be implemented in a future update"
-                }
+    async def generate_posts_batch(self, specs: List[Dict]) -> List[Dict]:
+        """
+        Generate several posts concurrently.
+        
+        At most BATCH_MAX_CONCURRENCY requests are in flight at once, and every
+        request waits for room under the client-side rate limits.
+        
+        Args:
+            specs (List[Dict]): Keyword arguments for generate_post_async, one dict per post
+            
+        Returns:
+            List[Dict]: Results in the same order as specs
+        """
+        semaphore = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
 
-            return response_data
+        async def generate(spec: Dict) -> Dict:
+            async with semaphore:
+                return await self.generate_post_async(**spec)
 
-        except APIError as e:
-            logger.error(f"OpenAI API error: {str(e)}")
-            return {
-                "success": False,
-                "error": f"OpenAI API error: {str(e)}"
-            }
-        except Exception as e:
-            logger.error(f"Unexpected error in post generation: {str(e)}")
-            return {
-                "success": False,
-                "error": f"Unexpected error in post generation: {str(e)}"
-            }
+        return await asyncio.gather(*(generate(spec) for spec in specs))
 
     def validate_response(self, content: str, min_chars: int, max_chars: int) -> bool:
         """
@@ -288,230 +651,422 @@ class OpenAIService:
         """
         char_count = len(content)
         return min_chars <= char_count <= max_chars
+
+    def _cached_analysis(self, content_embedding: Optional[List[float]]) -> Optional[Dict]:
+        """
+        Look up a semantically cached analysis for the content embedding.
         
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry_error_callback=lambda retry_state: None
-    )
-    def analyze_content(self, content: str) -> Dict:
+        Args:
+            content_embedding (Optional[List[float]]): Embedding of the content, if available
+            
+        Returns:
+            Optional[Dict]: Successful analysis response, or None on a miss
         """
-        Analyze content to extract keywords, sentiment, and other useful metadata.
+        if content_embedding is None:
+            return None
+        cached_data = self.analysis_cache.lookup(content_embedding)
+        if cached_data is None:
+            return None
+        _crumb(
+            category="analysis",
+            message="Using semantically cached analysis",
+            level="info"
+        )
+        return {
+            "success": True,
+            "data": cached_data
+        }
+
+    def _keyword_candidates(self, content: str) -> List[str]:
+        """
+        Count the most frequent non-stopword terms in the content.
         
         Args:
             content (str): The content to analyze
             
         Returns:
-            Dict: Analysis results including keywords, sentiment, entities, and topics
-            
-        Raises:
-            APIError: If OpenAI API call fails
+            List[str]: Up to 10 keywords, most frequent first
         """
-        try:
-            sentry_sdk.add_breadcrumb(
-                category="analysis",
-                message="Starting content analysis",
-                level="info"
-            )
-            
-            # Track which type of tokenizer we're using in Sentry
-            sentry_sdk.set_context("tokenizer", {
-                "type": "fallback" if self.use_fallback_tokenizer else "nltk",
-                "content_length": len(content)
-            })
-            
-            # First, perform basic analysis using NLTK or fallback tokenizer
-            try:
-                # Use the tokenize_text method which handles fallback
-                words = self.tokenize_text(content.lower())
-                sentry_sdk.add_breadcrumb(
-                    category="analysis",
-                    message=f"Tokenization successful: {len(words)} tokens",
-                    level="info"
-                )
-            except Exception as e:
-                logger.error(f"Error during tokenization: {str(e)}")
-                sentry_sdk.capture_exception(e)
-                # Use a very simple fallback tokenization as a last resort
-                words = re.findall(r'\w+', content.lower())
-                sentry_sdk.add_breadcrumb(
-                    category="analysis",
-                    message=f"Using emergency fallback tokenization after error: {len(words)} tokens",
-                    level="warning"
-                )
-            
-            # Get stopwords if available, otherwise use a simple list
-            try:
-                stop_words = set(stopwords.words('english'))
-            except Exception as e:
-                logger.warning(f"Error getting stopwords: {str(e)}")
-                # Simple fallback stopwords
-                stop_words = set(['the', 'a', 'an', 'and', 'in', 'on', 'at', 'to', 'for', 'of', 'with'])
-                sentry_sdk.add_breadcrumb(
-                    category="analysis",
-                    message="Using fallback stopwords",
-                    level="warning"
-                )
-            
-            # Filter words
-            try:
-                filtered_words = [word for word in words if word.isalnum() and word not in stop_words and len(word) > 3]
-                sentry_sdk.add_breadcrumb(
-                    category="analysis",
-                    message=f"Filtered to {len(filtered_words)} words",
-                    level="info"
-                )
-            except Exception as e:
-                logger.error(f"Error during word filtering: {str(e)}")
-                sentry_sdk.capture_exception(e)
-                filtered_words = words  # Use unfiltered words as fallback
-            
-            # Get word frequency
-            try:
-                from collections import Counter
-                word_counts = Counter(filtered_words)
-                keywords_nltk = [word for word, count in word_counts.most_common(10)]
-                sentry_sdk.add_breadcrumb(
-                    category="analysis",
-                    message="Extracted NLTK keywords successfully",
-                    level="info"
-                )
-            except Exception as e:
-                logger.error(f"Error during keyword extraction: {str(e)}")
-                sentry_sdk.capture_exception(e)
-                keywords_nltk = filtered_words[:10] if len(filtered_words) > 10 else filtered_words
-            
-            # Track state before OpenAI API call
-            sentry_sdk.add_breadcrumb(
-                category="analysis",
-                message="Preparing to call OpenAI API for advanced analysis",
-                level="info"
-            )
+        # Track which type of tokenizer we're using in Sentry
+        sentry_sdk.set_context("tokenizer", {
+            "type": "regex",
+            "content_length": len(content)
+        })
+        
+        # First, count keyword candidates from a single regex pass
+        word_counts = Counter(word for word in KEYWORD_TOKEN_RE.findall(content.lower()) if word not in STOP_WORDS)
+        local_keywords = [word for word, count in word_counts.most_common(10)]
+        _crumb(
+            category="analysis",
+            message=f"Extracted keywords from {sum(word_counts.values())} filtered words",
+            level="info"
+        )
+        return local_keywords
+
+    def _analysis_request(self, content: str) -> Tuple[str, Dict]:
+        """
+        Build the response cache key and chat completion arguments for an analysis.
+        
+        Args:
+            content (str): The content to analyze
             
-            # Then use OpenAI for more sophisticated analysis
-            prompt = f"""Analyze the following content for a LinkedIn post and extract:
+        Returns:
+            Tuple[str, Dict]: Response cache key and keyword arguments for chat.completions.create
+        """
+        # Track state before OpenAI API call
+        _crumb(
+            category="analysis",
+            message="Preparing to call OpenAI API for advanced analysis",
+            level="info"
+        )
+        
+        # Then use OpenAI for more sophisticated analysis
+        prompt = f"""Analyze the following content for a LinkedIn post and extract:
             1. Top 5-10 keywords or key phrases
             2. Overall sentiment (positive, negative, or neutral)
             3. Main topics covered
             4. Any entities mentioned (people, companies, products)
             
-            Return the analysis in a structured format that can be parsed as JSON.
+            Return the analysis as a JSON object with the keys "keywords", "sentiment",
+            "topics" and "entities".
             
             Content to analyze:
             {content}"""
 
-            # Make API call
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a content analysis expert. Extract structured information from text and return it in a JSON-compatible format."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,  # Lower temperature for more consistent analytical results
-                max_tokens=500,
-                top_p=1.0,
-                frequency_penalty=0.0,
-                presence_penalty=0.0
+        system_prompt = "You are a content analysis expert. Extract structured information from text and return it in a JSON-compatible format."
+        
+        # Identical content is served from the response cache when it is enabled
+        cache_key = response_cache_key(self.model, system_prompt, prompt, 0.3, 500)
+        request = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.3,  # Lower temperature for more consistent analytical results
+            "max_tokens": 500,
+            "top_p": 1.0,
+            "frequency_penalty": 0.0,
+            "presence_penalty": 0.0,
+            "response_format": {"type": "json_object"}
+        }
+        return cache_key, request
+
+    def _finish_analysis(self, analysis_text: str, cache_key: str, local_keywords: List[str],
+                         content_embedding: Optional[List[float]]) -> Dict:
+        """
+        Parse the model's analysis, merge in the local keywords and cache the result.
+        
+        Args:
+            analysis_text (str): JSON reply from the model
+            cache_key (str): Response cache key for the request
+            local_keywords (List[str]): Keywords counted locally
+            content_embedding (Optional[List[float]]): Embedding of the content, if available
+            
+        Returns:
+            Dict: Successful analysis response
+        """
+        # JSON mode guarantees a JSON object reply
+        analysis_data = _json_loads(analysis_text)
+        set_cached_response(cache_key, analysis_text)
+        _crumb(
+            category="analysis",
+            message="Successfully parsed response as JSON",
+            level="info"
+        )
+        
+        # Combine with the locally counted keywords for better coverage
+        if "keywords" in analysis_data and local_keywords:
+            # Add any local keywords not already in the OpenAI keywords, keeping order.
+            # Only string keywords are kept; the model occasionally nests lists or objects.
+            model_keywords = analysis_data["keywords"] if isinstance(analysis_data["keywords"], list) else []
+            model_keywords = [keyword for keyword in model_keywords if isinstance(keyword, str)]
+            combined_keywords = dict.fromkeys([*model_keywords, *local_keywords])
+            analysis_data["keywords"] = list(combined_keywords)[:15]  # Limit to 15 keywords
+        
+        _crumb(
+            category="analysis",
+            message="Content analysis completed successfully",
+            level="info"
+        )
+        
+        if content_embedding is not None:
+            self.analysis_cache.add(content_embedding, analysis_data)
+        
+        return {
+            "success": True,
+            "data": analysis_data
+        }
+
+    @safe_call("content analysis", report=True)
+    @sample_breadcrumbs
+    def analyze_content(self, content: str) -> Dict:
+        """
+        Analyze content to extract keywords, sentiment, and other useful metadata.
+        
+        Args:
+            content (str): The content to analyze
+            
+        Returns:
+            Dict: Analysis results including keywords, sentiment, entities, and topics
+        """
+        _crumb(
+            category="analysis",
+            message="Starting content analysis",
+            level="info"
+        )
+        
+        # Serve near-duplicate content from the semantic cache
+        content_embedding = None
+        if self.analysis_cache is not None:
+            content_embedding = self._embed(content)
+            cached = self._cached_analysis(content_embedding)
+            if cached is not None:
+                return cached
+        
+        local_keywords = self._keyword_candidates(content)
+        cache_key, request = self._analysis_request(content)
+        analysis_text = get_cached_response(cache_key)
+        if analysis_text:
+            _crumb(
+                category="analysis",
+                message="Using cached OpenAI analysis",
+                level="info"
             )
+        else:
+            # Make API call, retrying transient errors
+            response = self._create_completion(**request)
 
             # Extract generated analysis
             analysis_text = response.choices[0].message.content.strip()
-            sentry_sdk.add_breadcrumb(
+            _crumb(
                 category="analysis",
                 message="OpenAI API call successful",
                 level="info"
             )
+        
+        return self._finish_analysis(analysis_text, cache_key, local_keywords, content_embedding)
+
+    @safe_call("content analysis", report=True)
+    @sample_breadcrumbs
+    async def analyze_content_async(self, content: str) -> Dict:
+        """
+        Async version of analyze_content using the shared AsyncOpenAI client.
+        
+        Args:
+            content (str): The content to analyze
             
-            # Try to extract JSON from the response (if it's formatted as JSON)
-            import json
+        Returns:
+            Dict: Analysis results including keywords, sentiment, entities, and topics
+        """
+        _crumb(
+            category="analysis",
+            message="Starting content analysis",
+            level="info"
+        )
+        
+        # Serve near-duplicate content from the semantic cache
+        content_embedding = None
+        if self.analysis_cache is not None:
+            content_embedding = await self._embed_async(content)
+            cached = self._cached_analysis(content_embedding)
+            if cached is not None:
+                return cached
+        
+        cache_key, request = self._analysis_request(content)
+        analysis_text = await get_cached_response_async(cache_key)
+        if analysis_text:
+            local_keywords = self._keyword_candidates(content)
+            _crumb(
+                category="analysis",
+                message="Using cached OpenAI analysis",
+                level="info"
+            )
+        else:
+            # The prompt does not depend on the local keywords, so count them
+            # while the API call is in flight
+            local_keywords, response = await asyncio.gather(
+                run_blocking(self._keyword_candidates, content),
+                self._create_completion_async(**request)
+            )
+            analysis_text = response.choices[0].message.content.strip()
+            _crumb(
+                category="analysis",
+                message="OpenAI API call successful",
+                level="info"
+            )
+        
+        # Caching the result writes to Redis, so finish off the event loop
+        return await run_blocking(self._finish_analysis, analysis_text, cache_key, local_keywords, content_embedding)
+
+    @sample_breadcrumbs
+    def analyze_contents(self, contents: List[str]) -> List[Dict]:
+        """
+        Analyze several pieces of content with one chat completion per group of posts.
+        
+        Up to ANALYZE_GROUP_SIZE posts share a request, so they share the system
+        prompt and use one request against the rate limit instead of one each.
+        
+        Args:
+            contents (List[str]): The content to analyze
+            
+        Returns:
+            List[Dict]: One analyze_content-style result per content, in order
+        """
+        if len(contents) <= 1:
+            return [self.analyze_content(content) for content in contents]
+        
+        results: List[Optional[Dict]] = [None] * len(contents)
+        pending = []
+        for index, content in enumerate(contents):
+            local_keywords = self._keyword_candidates(content)
+            cache_key, _ = self._analysis_request(content)
+            analysis_text = get_cached_response(cache_key)
+            if analysis_text:
+                try:
+                    results[index] = self._finish_analysis(analysis_text, cache_key, local_keywords, None)
+                except Exception as e:
+                    results[index] = _error_response(e, "content analysis", report=True)
+            else:
+                pending.append((index, local_keywords, cache_key))
+        
+        for start in range(0, len(pending), ANALYZE_GROUP_SIZE):
+            group = pending[start:start + ANALYZE_GROUP_SIZE]
+            payload = [{"id": str(index), "content": contents[index]} for index, _, _ in group]
             try:
-                # First try to see if the whole response is JSON
-                analysis_data = json.loads(analysis_text)
-                sentry_sdk.add_breadcrumb(
-                    category="analysis",
-                    message="Successfully parsed response as JSON",
-                    level="info"
-                )
-            except json.JSONDecodeError:
-                # If not, use regex to try to extract JSON-like structure and parse manually
-                logger.info("Couldn't parse response as JSON, using processed output")
-                sentry_sdk.add_breadcrumb(
-                    category="analysis",
-                    message="Using regex-based extraction for non-JSON response",
-                    level="warning"
+                response = self._create_completion(
+                    model=self.model,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": """You are a content analysis expert. You will receive a JSON array of LinkedIn posts, each with an id. For each post, extract:
+                            1. Top 5-10 keywords or key phrases
+                            2. Overall sentiment (positive, negative, or neutral)
+                            3. Main topics covered
+                            4. Any entities mentioned (people, companies, products)
+                            
+                            Return a JSON object with an "analyses" key mapping each id to an object with the keys
+                            "keywords", "sentiment", "topics" and "entities", e.g. {"analyses": {"0": {...}, "1": {...}}}."""
+                        },
+                        {
+                            "role": "user",
+                            "content": json.dumps(payload)
+                        }
+                    ],
+                    temperature=0.3,
+                    max_tokens=500 * len(group),
+                    response_format={"type": "json_object"}
                 )
-                
-                # Fallback to a simpler, regex-based extraction
-                keywords_match = re.search(r'keywords?[:\s]+\[([^\]]+)\]', analysis_text, re.IGNORECASE)
-                keywords = []
-                if keywords_match:
-                    keywords_text = keywords_match.group(1)
-                    keywords = [k.strip().strip('"\'') for k in keywords_text.split(',')]
-                
-                sentiment_match = re.search(r'sentiment[:\s]+"?([a-z]+)"?', analysis_text, re.IGNORECASE)
-                sentiment = sentiment_match.group(1) if sentiment_match else "neutral"
-                
-                topics_match = re.search(r'topics?[:\s]+\[([^\]]+)\]', analysis_text, re.IGNORECASE)
-                topics = []
-                if topics_match:
-                    topics_text = topics_match.group(1)
-                    topics = [t.strip().strip('"\'') for t in topics_text.split(',')]
-                
-                entities_match = re.search(r'entities?[:\s]+\[([^\]]+)\]', analysis_text, re.IGNORECASE)
-                entities = []
-                if entities_match:
-                    entities_text = entities_match.group(1)
-                    entities = [e.strip().strip('"\'') for e in entities_text.split(',')]
-                
-                # Create structured analysis data
-                analysis_data = {
-                    "keywords": keywords or keywords_nltk,
-                    "sentiment": sentiment,
-                    "topics": topics,
-                    "entities": entities
-                }
+                analyses = _json_loads(response.choices[0].message.content)["analyses"]
+                if not isinstance(analyses, dict):
+                    raise ValueError(f"Expected a JSON object of analyses, got {type(analyses).__name__}")
+                logger.info(f"Analyzed {len(group)} posts in one request")
+            except Exception as e:
+                error = _error_response(e, "content analysis", report=True)
+                for index, _, _ in group:
+                    results[index] = dict(error)
+                continue
             
-            # Combine with NLTK keywords for better coverage
-            if "keywords" in analysis_data and keywords_nltk:
-                # Add any NLTK keywords not already in the OpenAI keywords
-                combined_keywords = list(analysis_data["keywords"])
-                for keyword in keywords_nltk:
-                    if keyword not in combined_keywords:
-                        combined_keywords.append(keyword)
-                analysis_data["keywords"] = combined_keywords[:15]  # Limit to 15 keywords
+            for index, local_keywords, cache_key in group:
+                try:
+                    analysis = analyses.get(str(index))
+                    if not isinstance(analysis, dict):
+                        raise ValueError(f"No analysis returned for post {index}")
+                    # Cached under the single-post key, so analyze_content can reuse it
+                    results[index] = self._finish_analysis(json.dumps(analysis), cache_key, local_keywords, None)
+                except Exception as e:
+                    results[index] = _error_response(e, "content analysis", report=True)
+        
+        return results
+
+    @sample_breadcrumbs
+    def analyze_content_batch(self, contents: List[str]) -> List[Dict]:
+        """
+        Analyze many pieces of content through the OpenAI Batch API.
+        
+        Batch requests cost half as much and have their own rate limits, but
+        can take up to 24 hours, so this blocks until the batch finishes and is
+        meant for offline jobs rather than request handlers.
+        
+        Args:
+            contents (List[str]): The content to analyze
             
-            sentry_sdk.add_breadcrumb(
-                category="analysis",
-                message="Content analysis completed successfully",
-                level="info"
+        Returns:
+            List[Dict]: One analyze_content-style result per content, in order
+        """
+        results: List[Optional[Dict]] = [None] * len(contents)
+        pending = {}
+        lines = []
+        for index, content in enumerate(contents):
+            local_keywords = self._keyword_candidates(content)
+            cache_key, request = self._analysis_request(content)
+            analysis_text = get_cached_response(cache_key)
+            if analysis_text:
+                try:
+                    results[index] = self._finish_analysis(analysis_text, cache_key, local_keywords, None)
+                except Exception as e:
+                    results[index] = _error_response(e, "content analysis", report=True)
+                continue
+            pending[str(index)] = (local_keywords, cache_key)
+            lines.append(json.dumps({
+                "custom_id": str(index),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": request
+            }))
+        
+        if not pending:
+            return results
+        
+        try:
+            batch_file = self.client.files.create(
+                file=("analysis_batch.jsonl", "\n".join(lines).encode("utf-8")),
+                purpose="batch"
+            )
+            batch = self.client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
             )
+            logger.info(f"Submitted analysis batch {batch.id} with {len(pending)} requests")
             
-            return {
-                "success": True,
-                "data": analysis_data
-            }
-
-        except APIError as e:
-            logger.error(f"OpenAI API error during content analysis: {str(e)}")
-            sentry_sdk.capture_exception(e)
-            sentry_sdk.set_context("api_error", {
-                "message": str(e),
-                "type": "api_error"
-            })
-            return {
-                "success": False,
-                "error": f"OpenAI API error: {str(e)}"
-            }
+            delay = BATCH_POLL_INITIAL_DELAY
+            while batch.status not in BATCH_TERMINAL_STATUSES:
+                time.sleep(delay)
+                delay = min(delay * 2, BATCH_POLL_MAX_DELAY)
+                batch = self.client.batches.retrieve(batch.id)
+            logger.info(f"Analysis batch {batch.id} finished with status {batch.status}")
+            
+            # Partially completed batches still have an output file for the requests that succeeded
+            output_lines = []
+            if batch.output_file_id:
+                output_lines = self.client.files.content(batch.output_file_id).text.splitlines()
         except Exception as e:
-            logger.error(f"Unexpected error in content analysis: {str(e)}")
-            logger.error(traceback.format_exc())
-            sentry_sdk.capture_exception(e)
-            sentry_sdk.set_context("error_details", {
-                "message": str(e),
-                "type": type(e).__name__,
-                "traceback": traceback.format_exc()
-            })
-            return {
+            error = _error_response(e, "content analysis", report=True)
+            return [result if result is not None else dict(error) for result in results]
+        
+        for line in output_lines:
+            if not line.strip():
+                continue
+            item = _json_loads(line)
+            custom_id = item.get("custom_id")
+            if custom_id not in pending:
+                continue
+            local_keywords, cache_key = pending.pop(custom_id)
+            try:
+                response = item.get("response") or {}
+                if item.get("error") or response.get("status_code") != 200:
+                    raise ValueError(f"Batch request failed: {item.get('error') or response.get('body')}")
+                analysis_text = response["body"]["choices"][0]["message"]["content"].strip()
+                results[int(custom_id)] = self._finish_analysis(analysis_text, cache_key, local_keywords, None)
+            except Exception as e:
+                results[int(custom_id)] = _error_response(e, "content analysis", report=True)
+        
+        # Requests missing from the output failed, or the batch ended before reaching them
+        for custom_id in pending:
+            results[int(custom_id)] = {
                 "success": False,
-                "error": f"Unexpected error in content analysis: {str(e)}"
-            } 
\ No newline at end of file
+                "error": f"Batch request did not complete (batch status: {batch.status})"
+            }
+        
+        return results
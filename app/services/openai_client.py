@@ -0,0 +1,166 @@
+"""
+Process-wide OpenAI clients.
+
+Every service shares the same sync client, and the same async client within an
+event loop, so HTTP keep-alive connections and TLS sessions are reused across
+requests.
+"""
+
+import os
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict
+
+from ..config import is_feature_enabled
+
+# The openai SDK (and httpx, pydantic underneath it) is imported on first client use,
+# keeping it off the import path of processes that never call the API
+if TYPE_CHECKING:
+    import httpx
+    import openai
+
+logger = logging.getLogger(__name__)
+
+# Keep-alive pool with bounded timeouts so calls reuse warm TLS connections
+# and a stalled request cannot hang a worker
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = 20
+OPENAI_MAX_CONNECTIONS = 50
+OPENAI_TIMEOUT = 30.0  # seconds
+OPENAI_CONNECT_TIMEOUT = 5.0  # seconds
+OPENAI_MAX_RETRIES = 2
+
+# Threads reserved for blocking OpenAI work started from async code, so it neither
+# stalls the event loop nor competes with the loop's default executor
+OPENAI_EXECUTOR_WORKERS = 32
+
+_openai_client = None
+# Async clients by event loop: their connection pools can only be used from the loop that opened them
+_async_openai_clients: Dict[asyncio.AbstractEventLoop, "openai.AsyncOpenAI"] = {}
+_openai_client_lock = threading.Lock()
+_openai_executor = ThreadPoolExecutor(max_workers=OPENAI_EXECUTOR_WORKERS, thread_name_prefix="openai")
+
+def _get_api_key() -> str:
+    """
+    Read the OpenAI API key from the environment.
+
+    Returns:
+        str: API key
+
+    Raises:
+        ValueError: If OPENAI_API_KEY is not set
+    """
+    api_key = os.getenv('OPENAI_API_KEY')
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY environment variable is not set")
+    return api_key
+
+def _http_client_options() -> Dict:
+    """
+    Build the connection pool limits and timeouts shared by both clients.
+
+    Returns:
+        Dict: Keyword arguments for httpx.Client / httpx.AsyncClient
+    """
+    import httpx
+    return {
+        "limits": httpx.Limits(
+            max_keepalive_connections=OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+            max_connections=OPENAI_MAX_CONNECTIONS
+        ),
+        "timeout": httpx.Timeout(OPENAI_TIMEOUT, connect=OPENAI_CONNECT_TIMEOUT),
+    }
+
+def _async_http_client() -> "httpx.AsyncClient":
+    """
+    Build the HTTP client for the async OpenAI client.
+
+    With the OPENAI_USE_AIOHTTP feature enabled, requests go through the SDK's
+    aiohttp-backed transport, which holds its throughput at high concurrency
+    where httpx's own transport slows down. This needs the openai[aiohttp] extra;
+    without it the default httpx transport is used.
+
+    Returns:
+        httpx.AsyncClient: HTTP client with the shared pool limits and timeouts
+    """
+    import httpx
+    import openai
+    if is_feature_enabled("OPENAI_USE_AIOHTTP"):
+        try:
+            return openai.DefaultAioHttpClient(**_http_client_options())
+        except RuntimeError as e:
+            logger.warning(f"aiohttp transport unavailable, using httpx: {str(e)}")
+    return httpx.AsyncClient(**_http_client_options())
+
+def get_openai_client() -> "openai.OpenAI":
+    """
+    Return the process-wide OpenAI client, initializing it on first use.
+
+    Returns:
+        openai.OpenAI: Shared OpenAI client
+    """
+    global _openai_client
+    if _openai_client is None:
+        with _openai_client_lock:
+            if _openai_client is None:
+                import httpx
+                import openai
+                _openai_client = openai.OpenAI(
+                    api_key=_get_api_key(),
+                    max_retries=OPENAI_MAX_RETRIES,
+                    http_client=httpx.Client(**_http_client_options())
+                )
+    return _openai_client
+
+def get_async_openai_client() -> "openai.AsyncOpenAI":
+    """
+    Return the async OpenAI client for the running event loop, initializing it on first use.
+
+    Each asyncio.run() call gets its own loop, and a client's pooled connections
+    fail once the loop that opened them is closed, so clients are kept per loop.
+    Clients of closed loops are dropped whenever a new one is created.
+
+    Returns:
+        openai.AsyncOpenAI: Async OpenAI client shared within the running loop
+
+    Raises:
+        RuntimeError: If called outside a running event loop
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_openai_clients.get(loop)
+    if client is None:
+        with _openai_client_lock:
+            client = _async_openai_clients.get(loop)
+            if client is None:
+                import openai
+                for closed_loop in [other for other in _async_openai_clients if other.is_closed()]:
+                    del _async_openai_clients[closed_loop]
+                client = openai.AsyncOpenAI(
+                    api_key=_get_api_key(),
+                    max_retries=OPENAI_MAX_RETRIES,
+                    http_client=_async_http_client()
+                )
+                _async_openai_clients[loop] = client
+    return client
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    Run a blocking OpenAI-bound call on the dedicated thread pool and await its result.
+
+    Like asyncio.to_thread, the call runs in a copy of the caller's context, so
+    context variables such as the breadcrumb sampling decision carry over.
+
+    Args:
+        func: Blocking callable
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        The return value of func
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(_openai_executor, functools.partial(context.run, func, *args, **kwargs))
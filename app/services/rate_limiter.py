@@ -0,0 +1,128 @@
+"""
+Client-side request and token rate limiting for the async OpenAI client.
+
+Requests wait for room in a sliding one-minute window instead of being sent
+and retried after a 429, so bulk jobs run at the account's limit rather than
+in bursts of failures and backoff.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_WINDOW = 60.0  # seconds
+
+# Rough prompt size estimate used before the API reports real usage
+CHARS_PER_TOKEN = 4
+
+def estimate_request_tokens(request: Dict) -> int:
+    """
+    Estimate the tokens a chat completion request will count against the limit.
+
+    Args:
+        request: Keyword arguments for chat.completions.create
+
+    Returns:
+        int: Prompt tokens (estimated from message length) plus max_tokens
+    """
+    prompt_chars = sum(len(message.get("content") or "") for message in request.get("messages", []))
+    return prompt_chars // CHARS_PER_TOKEN + request.get("max_tokens", 0)
+
+def retry_after_seconds(error) -> Optional[float]:
+    """
+    Read the wait requested by the API from a rate limit error's headers.
+
+    Args:
+        error: openai.RateLimitError
+
+    Returns:
+        Optional[float]: Seconds to wait, or None if the response has no usable header
+    """
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except ValueError:
+        pass
+    return None
+
+class RateLimiter:
+    """
+    Sliding-window limit on requests and tokens per minute.
+
+    Meant to be used from a single event loop: the check and the reservation in
+    acquire happen without an await in between, so no lock is needed.
+    """
+
+    def __init__(self, max_requests_per_minute: int, max_tokens_per_minute: int):
+        """
+        Initialize an empty window.
+
+        Args:
+            max_requests_per_minute: Requests allowed in any 60 second window
+            max_tokens_per_minute: Tokens allowed in any 60 second window
+        """
+        self.max_requests_per_minute = max_requests_per_minute
+        self.max_tokens_per_minute = max_tokens_per_minute
+        # (time.monotonic() of the request, tokens reserved for it)
+        self._requests: Deque[Tuple[float, int]] = deque()
+        self._tokens_in_window = 0
+        self._resume_at = 0.0
+
+    def _prune(self, now: float) -> None:
+        """Drop requests that have left the window."""
+        while self._requests and self._requests[0][0] <= now - RATE_LIMIT_WINDOW:
+            _, tokens = self._requests.popleft()
+            self._tokens_in_window -= tokens
+
+    def _wait_time(self, tokens: int, now: float) -> float:
+        """Seconds until a request of this size fits in the window, 0 if it fits now."""
+        if now < self._resume_at:
+            return self._resume_at - now
+        if not self._requests:
+            return 0.0
+        if len(self._requests) < self.max_requests_per_minute and \
+                self._tokens_in_window + tokens <= self.max_tokens_per_minute:
+            return 0.0
+        # Wait for the oldest request to leave the window, then check again
+        return self._requests[0][0] + RATE_LIMIT_WINDOW - now
+
+    async def acquire(self, tokens: int) -> None:
+        """
+        Wait until the window has room for one request of the given size, then reserve it.
+
+        A request larger than the whole token budget is let through once the window is empty.
+
+        Args:
+            tokens: Estimated tokens for the request
+        """
+        while True:
+            now = time.monotonic()
+            self._prune(now)
+            delay = self._wait_time(tokens, now)
+            if delay <= 0:
+                self._requests.append((now, tokens))
+                self._tokens_in_window += tokens
+                return
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Hold back every pending request, e.g. after the API answered with a 429.
+
+        Args:
+            seconds: How long to stop sending requests
+        """
+        resume_at = time.monotonic() + seconds
+        if resume_at > self._resume_at:
+            logger.warning(f"OpenAI rate limit reached, pausing requests for {seconds:.1f}s")
+            self._resume_at = resume_at
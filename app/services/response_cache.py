@@ -0,0 +1,209 @@
+"""
+Exact-match cache for OpenAI responses.
+
+Results are kept in a small in-process LRU with a one-hour TTL and shared
+across workers through Redis. Both layers are enabled with the
+OPENAI_RESPONSE_CACHE feature flag.
+
+A reply is cached when the caller wants a result for its input and any good
+reply will do, even if it was sampled: content analyses in OpenAIService, and
+narration rewrites and segment breakdowns in TextProcessor. A reply is not
+cached when a repeated request is asking for a new sample: generated posts are
+sampled at temperature 0.7, and asking again for a post on the same theme is
+asking for a different post.
+"""
+
+import os
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+import redis
+
+from ..config import is_feature_enabled
+from .openai_client import run_blocking
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_PREFIX = "openai_response:"
+RESPONSE_CACHE_TTL = 7 * 86400  # seconds
+LOCAL_CACHE_SIZE = 1024
+LOCAL_CACHE_TTL = 3600  # seconds
+# Cache lookups must never hold up an OpenAI call for long: Redis gets short
+# timeouts, and after a connection failure it is skipped for a cooldown period
+REDIS_SOCKET_TIMEOUT = 0.5  # seconds
+REDIS_FAILURE_COOLDOWN = 30.0  # seconds
+
+_redis_client = None
+# time.monotonic() until which Redis is skipped after a connection failure
+_redis_retry_at = 0.0
+# key -> (response, expiry as time.monotonic())
+_local_cache: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+_local_cache_lock = threading.Lock()
+
+def response_cache_enabled() -> bool:
+    """
+    Check whether OpenAI responses should be cached.
+
+    Returns:
+        bool: True if the OPENAI_RESPONSE_CACHE feature is enabled
+    """
+    return is_feature_enabled("OPENAI_RESPONSE_CACHE")
+
+def get_redis_client() -> redis.Redis:
+    """
+    Return the Redis client shared by the response cache, creating it on first use.
+
+    Returns:
+        redis.Redis: Redis client
+    """
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.from_url(
+            os.getenv('REDIS_URL', 'redis://localhost:6379/0'),
+            socket_connect_timeout=REDIS_SOCKET_TIMEOUT,
+            socket_timeout=REDIS_SOCKET_TIMEOUT
+        )
+    return _redis_client
+
+def _redis_available() -> bool:
+    """Check whether Redis is outside its cooldown after a connection failure."""
+    return time.monotonic() >= _redis_retry_at
+
+def _redis_failed(operation: str, error: redis.RedisError) -> None:
+    """
+    Log a failed Redis call, skipping Redis for a while if it could not be reached.
+
+    Args:
+        operation: What was being done, e.g. "lookup"
+        error: The error raised
+    """
+    global _redis_retry_at
+    if isinstance(error, (redis.ConnectionError, redis.TimeoutError)):
+        _redis_retry_at = time.monotonic() + REDIS_FAILURE_COOLDOWN
+        logger.warning(f"Response cache {operation} failed, skipping Redis for {REDIS_FAILURE_COOLDOWN:.0f}s: {str(error)}")
+    else:
+        logger.warning(f"Response cache {operation} failed: {str(error)}")
+
+def response_cache_key(*parts) -> str:
+    """
+    Build a cache key from the inputs that determine an OpenAI response.
+
+    Args:
+        *parts: Model, prompts and sampling parameters of the request
+
+    Returns:
+        str: Redis key
+    """
+    digest = hashlib.sha256('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return f"{RESPONSE_CACHE_PREFIX}{digest}"
+
+def get_cached_response(key: str) -> Optional[str]:
+    """
+    Look up a cached response, checking the in-process cache before Redis.
+
+    Args:
+        key: Key from response_cache_key
+
+    Returns:
+        Optional[str]: Cached response, or None on a miss or when caching is disabled
+    """
+    if not response_cache_enabled():
+        return None
+
+    value = _recall(key)
+    if value is not None or not _redis_available():
+        return value
+    return _redis_get(key)
+
+def set_cached_response(key: str, value: str) -> None:
+    """
+    Store a response in the in-process cache and in Redis.
+
+    Args:
+        key: Key from response_cache_key
+        value: Response text to cache
+    """
+    if not response_cache_enabled() or not value:
+        return
+
+    _remember(key, value)
+    if _redis_available():
+        _redis_set(key, value)
+
+async def get_cached_response_async(key: str) -> Optional[str]:
+    """
+    Async version of get_cached_response; the Redis lookup runs off the event loop.
+
+    Args:
+        key: Key from response_cache_key
+
+    Returns:
+        Optional[str]: Cached response, or None on a miss or when caching is disabled
+    """
+    if not response_cache_enabled():
+        return None
+
+    value = _recall(key)
+    if value is not None or not _redis_available():
+        return value
+    return await run_blocking(_redis_get, key)
+
+async def set_cached_response_async(key: str, value: str) -> None:
+    """
+    Async version of set_cached_response; the Redis write runs off the event loop.
+
+    Args:
+        key: Key from response_cache_key
+        value: Response text to cache
+    """
+    if not response_cache_enabled() or not value:
+        return
+
+    _remember(key, value)
+    if _redis_available():
+        await run_blocking(_redis_set, key, value)
+
+def _redis_get(key: str) -> Optional[str]:
+    """Look up a response in Redis, copying a hit into the in-process cache."""
+    try:
+        cached = get_redis_client().get(key)
+    except redis.RedisError as e:
+        _redis_failed("lookup", e)
+        return None
+    if cached is None:
+        return None
+
+    value = cached.decode('utf-8')
+    _remember(key, value)
+    return value
+
+def _redis_set(key: str, value: str) -> None:
+    """Store a response in Redis with the cache TTL."""
+    try:
+        get_redis_client().setex(key, RESPONSE_CACHE_TTL, value)
+    except redis.RedisError as e:
+        _redis_failed("write", e)
+
+def _recall(key: str) -> Optional[str]:
+    """Look up a response in the in-process LRU, dropping it if expired."""
+    with _local_cache_lock:
+        entry = _local_cache.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at > time.monotonic():
+            _local_cache.move_to_end(key)
+            return value
+        del _local_cache[key]
+        return None
+
+def _remember(key: str, value: str) -> None:
+    """Add a response to the in-process LRU, evicting the oldest entry when full."""
+    with _local_cache_lock:
+        _local_cache[key] = (value, time.monotonic() + LOCAL_CACHE_TTL)
+        _local_cache.move_to_end(key)
+        if len(_local_cache) > LOCAL_CACHE_SIZE:
+            _local_cache.popitem(last=False)
@@ -0,0 +1,94 @@
+"""
+In-process semantic cache keyed by text embeddings.
+
+Near-duplicate inputs (cosine similarity above a threshold) are served the
+result stored for an earlier input, skipping a chat completion.
+"""
+
+import copy
+import logging
+import threading
+from typing import Any, List, Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_DIM = 1536
+
+class SemanticCache:
+    """
+    Fixed-size store of (embedding, value) pairs searched by cosine similarity.
+
+    Embeddings are L2-normalized on insert, so a lookup is a single
+    matrix-vector product over the stored rows. When full, the oldest entry
+    is overwritten.
+    """
+
+    def __init__(self, threshold: float = 0.92, max_entries: int = 1000, dim: int = EMBEDDING_DIM):
+        """
+        Initialize an empty cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a hit
+            max_entries: Number of entries kept before the oldest is overwritten
+            dim: Embedding dimension
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._embeddings = np.zeros((max_entries, dim), dtype=np.float32)
+        self._values: List[Any] = [None] * max_entries
+        self._size = 0
+        self._next = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(embedding) -> Optional[np.ndarray]:
+        """Return the embedding as a unit-length float32 vector, or None if it is all zeros."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return None
+        return vector / norm
+
+    def lookup(self, embedding) -> Optional[Any]:
+        """
+        Find the value stored for the most similar embedding.
+
+        Args:
+            embedding: Query embedding
+
+        Returns:
+            A copy of the cached value if its similarity exceeds the threshold, else None
+        """
+        query = self._normalize(embedding)
+        if query is None:
+            return None
+
+        with self._lock:
+            if self._size == 0:
+                return None
+            similarities = self._embeddings[:self._size] @ query
+            best = int(np.argmax(similarities))
+            if similarities[best] <= self.threshold:
+                return None
+            logger.info(f"Semantic cache hit with similarity {similarities[best]:.3f}")
+            return copy.deepcopy(self._values[best])
+
+    def add(self, embedding, value: Any) -> None:
+        """
+        Store a value under an embedding.
+
+        Args:
+            embedding: Embedding of the input the value was computed for
+            value: Value to return for similar inputs
+        """
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+
+        with self._lock:
+            self._embeddings[self._next] = vector
+            self._values[self._next] = copy.deepcopy(value)
+            self._next = (self._next + 1) % self.max_entries
+            self._size = min(self._size + 1, self.max_entries)
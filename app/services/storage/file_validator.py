@@ -1,9 +1,43 @@
 import os
-import magic
 import logging
-from typing import List, Tuple, Dict, Any
+import tempfile
+from typing import List, Tuple, Dict, Any, Optional
 from werkzeug.datastructures import FileStorage
 
+# Leading bytes that identify each image type, checked before falling back to libmagic
+IMAGE_SIGNATURES = (
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+)
+# MIME types _sniff_image can recognize ('image/jpg' is a common alias for JPEG)
+SNIFFABLE_TYPES = frozenset(['image/jpeg', 'image/jpg', 'image/png', 'image/gif'])
+# Bytes needed to match any signature above
+SNIFF_SIZE = 16
+# Bytes libmagic needs for MIME detection
+MAGIC_READ_SIZE = 2048
+
+# Characters sanitize_filename keeps: alphanumeric, dash, underscore, and dot
+SAFE_FILENAME_CHARS = b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_."
+# Every other ASCII byte, for deletion with bytes.translate
+UNSAFE_FILENAME_BYTES = bytes(b for b in range(128) if b not in SAFE_FILENAME_CHARS)
+
+def _sniff_image(content: bytes) -> Optional[str]:
+    """
+    Identify an image from its leading bytes.
+    
+    Args:
+        content: The first bytes of the file
+        
+    Returns:
+        Optional[str]: The image MIME type, or None if no signature matches
+    """
+    for signature, mime_type in IMAGE_SIGNATURES:
+        if content.startswith(signature):
+            return mime_type
+    return None
+
 class FileValidator:
     """
     Service for validating uploaded files against constraints.
@@ -30,6 +64,8 @@ class FileValidator:
         self.max_files = max_files
         self.max_file_size = max_file_size
         self.allowed_types = allowed_types or ['image/jpeg', 'image/png', 'image/jpg']
+        # libmagic is only needed when some allowed type can't be told apart by its signature
+        self.needs_magic = not SNIFFABLE_TYPES.issuperset(self.allowed_types)
         self.logger = logging.getLogger(__name__)
         
     def validate_files(self, files: List[FileStorage]) -> Tuple[bool, Dict[str, Any]]:
@@ -40,7 +76,9 @@ class FileValidator:
             files: List of file objects to validate
             
         Returns:
-            Tuple[bool, Dict]: (is_valid, validation_result)
+            Tuple[bool, Dict]: (is_valid, validation_result). On success the result's
+                "file_data" holds each file's contents, in order, so they can be
+                uploaded without reading the files again.
         """
         self.logger.info(f"Validating {len(files)} files")
         
@@ -54,29 +92,34 @@ class FileValidator:
         
         total_size = 0
         validation_errors = []
+        file_data = []
         
         for file in files:
             # Check file size
             file_size = file.content_length or 0
             if file_size == 0:
-                # If content_length is not available, try to get the size by reading the file
-                file.seek(0, os.SEEK_END)
-                file_size = file.tell()
-                file.seek(0)  # Reset file pointer
+                # If content_length is not available, get the size from the stream
+                file_size = self._stream_size(file)
                 
-            if file_size > self.max_file_size:
-                error_msg = f"File {file.filename} exceeds maximum size of {self.max_file_size / (1024 * 1024)}MB"
-                self.logger.warning(error_msg)
-                validation_errors.append(error_msg)
+            oversized = file_size > self.max_file_size
+            first_error = len(validation_errors)
             
             total_size += file_size
             
-            # Check file type using python-magic
+            # Check file type from its signature, using python-magic only for other types
             try:
-                file_content = file.read(2048)  # Read first 2KB for MIME detection
+                if oversized:
+                    # The file will be rejected, so only read what the type check needs
+                    file_content = file.read(MAGIC_READ_SIZE if self.needs_magic else SNIFF_SIZE)
+                else:
+                    # Read the file once for both the checks and the upload, stopping
+                    # one byte past the limit in case the reported size was wrong
+                    file_content = file.read(self.max_file_size + 1)
+                    oversized = len(file_content) > self.max_file_size
+                    file_data.append(file_content)
                 file.seek(0)  # Reset file pointer
                 
-                mime_type = magic.from_buffer(file_content, mime=True)
+                mime_type = self._detect_mime_type(file_content[:MAGIC_READ_SIZE])
                 if mime_type not in self.allowed_types:
                     error_msg = f"File {file.filename} has unsupported type: {mime_type}"
                     self.logger.warning(error_msg)
@@ -90,6 +133,12 @@ class FileValidator:
                 self.logger.error(error_msg)
                 validation_errors.append(error_msg)
             
+            if oversized:
+                error_msg = f"File {file.filename} exceeds maximum size of {self.max_file_size / (1024 * 1024)}MB"
+                self.logger.warning(error_msg)
+                # Size errors are listed before the file's content errors
+                validation_errors.insert(first_error, error_msg)
+            
         if total_size > (self.max_files * self.max_file_size):
             error_msg = f"Total upload size exceeds maximum of {self.max_files * self.max_file_size / (1024 * 1024)}MB"
             self.logger.warning(error_msg)
@@ -99,8 +148,54 @@ class FileValidator:
             return False, {"error": validation_errors}
             
         self.logger.info("Files validated successfully")
-        return True, {"message": "Files validated successfully"}
+        return True, {"message": "Files validated successfully", "file_data": file_data}
     
+    def _stream_size(self, file: FileStorage) -> int:
+        """
+        Get the size of an uploaded file's data.
+        
+        Streams backed by a real file are measured with fstat. Werkzeug's
+        SpooledTemporaryFile uploads and other streams are measured by seeking
+        to the end, since fileno() would roll an in-memory spool over to disk.
+        
+        Args:
+            file: The file object
+            
+        Returns:
+            int: Size in bytes
+        """
+        stream = file.stream
+        if not isinstance(stream, tempfile.SpooledTemporaryFile):
+            try:
+                return os.fstat(stream.fileno()).st_size
+            except (AttributeError, OSError, ValueError):
+                # No usable file descriptor (e.g. BytesIO)
+                pass
+        
+        file.seek(0, os.SEEK_END)
+        file_size = file.tell()
+        file.seek(0)  # Reset file pointer
+        return file_size
+        
+    def _detect_mime_type(self, content: bytes) -> str:
+        """
+        Detect a file's MIME type from its first bytes.
+        
+        Args:
+            content: The first bytes of the file
+            
+        Returns:
+            str: The detected MIME type, or 'application/octet-stream' if unrecognized
+        """
+        mime_type = _sniff_image(content)
+        if mime_type is not None:
+            return mime_type
+        if not self.needs_magic:
+            return 'application/octet-stream'
+        
+        import magic
+        return magic.from_buffer(content, mime=True)
+        
     def _check_file_content_safety(self, file: FileStorage, content: bytes, mime_type: str, errors: List[str]) -> None:
         """
         Perform additional safety checks on file content.
@@ -143,9 +238,9 @@ class FileValidator:
         filename = os.path.basename(filename)
         
         # Remove any potentially dangerous characters
-        # Keep only alphanumeric, dash, underscore, and dot
-        safe_chars = set("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_.")
-        filename = ''.join(c for c in filename if c in safe_chars)
+        # Keep only alphanumeric, dash, underscore, and dot: non-ASCII characters are
+        # dropped by the encode, the remaining unsafe ones by translate
+        filename = filename.encode('ascii', 'ignore').translate(None, UNSAFE_FILENAME_BYTES).decode('ascii')
         
         # Ensure the filename is not empty
         if not filename:
@@ -2,18 +2,51 @@ import os
 import uuid
 import logging
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional, Tuple
 from werkzeug.datastructures import FileStorage
 from google.cloud import storage
 from google.cloud.storage import Blob
+from google.api_core.exceptions import NotFound
 import redis
 
 # Import the existing storage service
 from ..video.storage import StorageService
+from ..response_cache import REDIS_SOCKET_TIMEOUT, REDIS_FAILURE_COOLDOWN
 
 logger = logging.getLogger(__name__)
 
+# Partial response for bucket listings: lookups only need blob names, plus the
+# page token so iteration can continue past the first page
+LIST_BLOB_FIELDS = "items(name),nextPageToken"
+
+# GCS accepts up to 100 calls in one batch request
+DELETE_BATCH_SIZE = 100
+
+# Files up to this size are read into memory and sent in a single request;
+# larger ones are streamed in resumable chunks of UPLOAD_CHUNK_SIZE
+SIMPLE_UPLOAD_MAX_SIZE = 8 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 4 * 1024 * 1024  # must be a multiple of 256KB
+
+def _file_size(file: FileStorage) -> int:
+    """
+    Get the size of an uploaded file's data without reading it.
+    
+    Args:
+        file: The file object
+        
+    Returns:
+        int: Size in bytes
+    """
+    stream = file.stream
+    position = stream.tell()
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(position)
+    return size
+
 class ImageStorageService:
     """
     Service for storing and retrieving user-uploaded images in Google Cloud Storage.
@@ -21,6 +54,9 @@ class ImageStorageService:
     This service extends the existing StorageService functionality to handle image uploads.
     """
     
+    # Uploads are network bound, so a batch is sent on up to this many threads
+    MAX_UPLOAD_WORKERS = 16
+    
     def __init__(self):
         """Initialize the image storage service using the existing GCS configuration."""
         # Reuse the existing StorageService for GCS access
@@ -35,11 +71,32 @@ class ImageStorageService:
         # Setup Redis connection for fallback URL storage
         redis_host = os.environ.get('REDIS_HOST', 'localhost')
         redis_port = int(os.environ.get('REDIS_PORT', 6379))
-        self.redis_client = redis.Redis(host=redis_host, port=redis_port, db=0)
+        # Redis sits on the upload and delete paths, so it gets the response cache's short
+        # timeouts and is skipped for a while after a connection failure
+        self.redis_client = redis.Redis(
+            host=redis_host,
+            port=redis_port,
+            db=0,
+            socket_connect_timeout=REDIS_SOCKET_TIMEOUT,
+            socket_timeout=REDIS_SOCKET_TIMEOUT
+        )
+        self._redis_retry_at = 0.0
         self.redis_stock_prefix = "stock_media_url:"
+        self.redis_image_path_prefix = "image_path:"
+        self.redis_signed_url_prefix = "signed_url:"
         
         logger.info(f"Initialized ImageStorageService with bucket: {self.bucket_name}")
         
+    def _redis_available(self) -> bool:
+        """Check whether Redis is outside its cooldown after a connection failure."""
+        return time.monotonic() >= self._redis_retry_at
+        
+    def _redis_failed(self, error: Exception) -> None:
+        """Skip Redis for REDIS_FAILURE_COOLDOWN seconds if the error shows it could not be reached."""
+        if isinstance(error, (redis.ConnectionError, redis.TimeoutError)):
+            self._redis_retry_at = time.monotonic() + REDIS_FAILURE_COOLDOWN
+            logger.warning(f"Redis unreachable, skipping it for {REDIS_FAILURE_COOLDOWN:.0f}s")
+        
     def store_stock_media_url(self, stock_id: str, original_url: str, media_type: str = 'image') -> bool:
         """
         Store the original URL for a stock media item in Redis
@@ -52,6 +109,8 @@ class ImageStorageService:
         Returns:
             bool: True if successful
         """
+        if not self._redis_available():
+            return False
         try:
             # Create a record with metadata
             record = {
@@ -69,6 +128,7 @@ class ImageStorageService:
             logger.info(f"Stored fallback URL for {stock_id}: {original_url}")
             return True
         except Exception as e:
+            self._redis_failed(e)
             logger.error(f"Error storing stock media URL for {stock_id}: {e}")
             return False
             
@@ -82,6 +142,8 @@ class ImageStorageService:
         Returns:
             Optional[str]: The original URL if found
         """
+        if not self._redis_available():
+            return None
         try:
             # Get the record from Redis
             record = self.redis_client.get(f"{self.redis_stock_prefix}{stock_id}")
@@ -91,79 +153,262 @@ class ImageStorageService:
                 return data['url']
             return None
         except Exception as e:
+            self._redis_failed(e)
             logger.error(f"Error retrieving stock media URL for {stock_id}: {e}")
             return None
+            
+    def store_image_path(self, image_id: str, storage_path: str) -> bool:
+        """
+        Remember where an uploaded image is stored so it can be found without listing the bucket
+        
+        Args:
+            image_id: The image ID
+            storage_path: Path of the image blob in the bucket
+            
+        Returns:
+            bool: True if successful
+        """
+        if not self._redis_available():
+            return False
+        try:
+            # Store in Redis with 30-day expiration
+            self.redis_client.setex(
+                f"{self.redis_image_path_prefix}{image_id}",
+                timedelta(days=30).total_seconds(),
+                storage_path
+            )
+            return True
+        except Exception as e:
+            self._redis_failed(e)
+            logger.error(f"Error storing image path for {image_id}: {e}")
+            return False
+            
+    def get_image_path(self, image_id: str) -> Optional[str]:
+        """
+        Look up the storage path recorded for an image in Redis
+        
+        Args:
+            image_id: The image ID
+            
+        Returns:
+            Optional[str]: The storage path if known
+        """
+        if not self._redis_available():
+            return None
+        try:
+            path = self.redis_client.get(f"{self.redis_image_path_prefix}{image_id}")
+            if path:
+                return path.decode('utf-8') if isinstance(path, bytes) else path
+            return None
+        except Exception as e:
+            self._redis_failed(e)
+            logger.error(f"Error retrieving image path for {image_id}: {e}")
+            return None
+            
+    def forget_image_path(self, image_id: str) -> None:
+        """
+        Remove the storage path recorded for an image from Redis
+        
+        Args:
+            image_id: The image ID
+        """
+        if not self._redis_available():
+            return
+        try:
+            self.redis_client.delete(f"{self.redis_image_path_prefix}{image_id}")
+        except Exception as e:
+            self._redis_failed(e)
+            logger.error(f"Error removing image path for {image_id}: {e}")
+            
+    def forget_signed_url(self, storage_path: str) -> None:
+        """
+        Remove the signed URL cached for a blob from Redis, so a deleted image's URL is not served
+        
+        Args:
+            storage_path: Path of the blob in the bucket
+        """
+        if not self._redis_available():
+            return
+        try:
+            self.redis_client.delete(f"{self.redis_signed_url_prefix}{storage_path}")
+        except Exception as e:
+            self._redis_failed(e)
+            logger.error(f"Error removing signed URL for {storage_path}: {e}")
+            
+    def get_signed_url(self, storage_path: str, blob: Optional[Blob] = None) -> str:
+        """
+        Get a signed URL for a blob, reusing one cached in Redis while it is still valid
+        
+        URLs are signed for 1 day and cached for 23 hours, so a cached URL always
+        has at least an hour left.
+        
+        Args:
+            storage_path: Path of the blob in the bucket
+            blob: Optional blob object for the path, created if needed
+            
+        Returns:
+            str: Signed URL for the blob
+        """
+        if self._redis_available():
+            try:
+                cached_url = self.redis_client.get(f"{self.redis_signed_url_prefix}{storage_path}")
+                if cached_url:
+                    return cached_url.decode('utf-8') if isinstance(cached_url, bytes) else cached_url
+            except Exception as e:
+                self._redis_failed(e)
+                logger.error(f"Error retrieving signed URL for {storage_path}: {e}")
+        return self._sign_url(storage_path, blob)
+        
+    def _sign_url(self, storage_path: str, blob: Optional[Blob] = None) -> str:
+        """
+        Sign a new URL for a blob and cache it in Redis for get_signed_url
+        
+        Used directly for blobs that were just uploaded, which cannot have a cached URL yet.
+        
+        Args:
+            storage_path: Path of the blob in the bucket
+            blob: Optional blob object for the path, created if needed
+            
+        Returns:
+            str: Signed URL for the blob
+        """
+        # Generate a signed URL for temporary access (valid for 1 day)
+        if blob is None:
+            blob = self.bucket.blob(storage_path)
+        url = blob.generate_signed_url(
+            version="v4",
+            expiration=timedelta(days=1),
+            method="GET"
+        )
+        
+        if self._redis_available():
+            try:
+                self.redis_client.setex(
+                    f"{self.redis_signed_url_prefix}{storage_path}",
+                    timedelta(hours=23).total_seconds(),
+                    url
+                )
+            except Exception as e:
+                self._redis_failed(e)
+                logger.error(f"Error caching signed URL for {storage_path}: {e}")
+        return url
     
-    def upload_images(self, files: List[FileStorage], user_id: str = None) -> List[Dict[str, Any]]:
+    def upload_images(self, files: List[FileStorage], user_id: str = None,
+                      file_data: Optional[List[bytes]] = None) -> List[Dict[str, Any]]:
         """
-        Upload multiple images to Google Cloud Storage.
+        Upload multiple images to Google Cloud Storage in parallel.
         
         Args:
             files: List of file objects to upload
             user_id: Optional user ID for organizing uploads
+            file_data: Optional contents of each file, already read by FileValidator,
+                uploaded instead of reading the files again
             
         Returns:
             List of dictionaries with image details
         """
-        uploaded_images = []
-        
         # Create a folder structure with date for better organization
         date_prefix = datetime.now().strftime('%Y/%m/%d')
         user_folder = user_id or 'anonymous'
         
-        for file in files:
+        # Read small files on this thread; each large file is streamed by the one worker uploading it
+        uploads = []
+        for index, file in enumerate(files):
             try:
-                # Generate a unique ID for the image
-                image_id = str(uuid.uuid4())
-                
-                # Create a safe filename
-                original_filename = file.filename
-                file_extension = os.path.splitext(original_filename)[1].lower()
-                safe_filename = f"{image_id}{file_extension}"
-                
-                # Determine storage path
-                storage_path = f"{self.image_folder}/{date_prefix}/{user_folder}/{safe_filename}"
-                
-                # Create a blob and upload the file
-                blob = self.bucket.blob(storage_path)
-                
-                # Set metadata
-                metadata = {
-                    'original_filename': original_filename,
-                    'content_type': file.content_type,
-                    'user_id': user_id or 'anonymous',
-                    'upload_date': datetime.now().isoformat(),
-                    'image_id': image_id  # Store the image ID in metadata
-                }
-                blob.metadata = metadata
-                
-                # Upload the file
-                blob.upload_from_file(file)
-                
-                # Generate a signed URL for temporary access (valid for 1 day)
-                signed_url = blob.generate_signed_url(
-                    version="v4",
-                    expiration=timedelta(days=1),
-                    method="GET"
-                )
-                
-                # Add to uploaded images list
-                uploaded_images.append({
-                    "id": image_id,
-                    "filename": original_filename,
-                    "storage_path": storage_path,
-                    "url": signed_url,
-                    "content_type": file.content_type
-                })
-                
-                logger.info(f"Successfully uploaded image {image_id} to {storage_path}")
-                
+                if file_data is not None:
+                    data = file_data[index]
+                elif _file_size(file) <= SIMPLE_UPLOAD_MAX_SIZE:
+                    data = file.read()
+                else:
+                    data = None
+                uploads.append((file, data))
             except Exception as e:
-                logger.error(f"Error uploading file {file.filename}: {str(e)}")
-                # Continue with other files even if one fails
-                continue
-                
-        return uploaded_images
+                logger.error(f"Error reading file {file.filename}: {str(e)}")
+        
+        if not uploads:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(self.MAX_UPLOAD_WORKERS, len(uploads))) as executor:
+            results = list(executor.map(
+                lambda args: self._upload_one(args[0], args[1], user_id, date_prefix, user_folder),
+                uploads
+            ))
+        
+        # Failed uploads are skipped so the other files still go through
+        return [image for image in results if image is not None]
+    
+    def _upload_one(self, file: FileStorage, data: Optional[bytes], user_id: Optional[str],
+                    date_prefix: str, user_folder: str) -> Optional[Dict[str, Any]]:
+        """
+        Upload a single image, called from the upload_images worker threads.
+        
+        Args:
+            file: The file object being uploaded
+            data: Contents of the file, or None to stream it from the file in chunks
+            user_id: Optional user ID for organizing uploads
+            date_prefix: Date folder for the upload
+            user_folder: User folder for the upload
+            
+        Returns:
+            Optional[Dict[str, Any]]: Image details, or None if the upload failed
+        """
+        try:
+            # Generate a unique ID for the image
+            image_id = str(uuid.uuid4())
+            
+            # Create a safe filename
+            original_filename = file.filename
+            file_extension = os.path.splitext(original_filename)[1].lower()
+            safe_filename = f"{image_id}{file_extension}"
+            
+            # Determine storage path
+            storage_path = f"{self.image_folder}/{date_prefix}/{user_folder}/{safe_filename}"
+            
+            # Create a blob and upload the file
+            blob = self.bucket.blob(storage_path)
+            
+            # Set metadata
+            metadata = {
+                'original_filename': original_filename,
+                'content_type': file.content_type,
+                'user_id': user_id or 'anonymous',
+                'upload_date': datetime.now().isoformat(),
+                'image_id': image_id  # Store the image ID in metadata
+            }
+            blob.metadata = metadata
+            
+            # Upload the file
+            if data is not None:
+                blob.upload_from_string(data, content_type=file.content_type)
+            else:
+                # Resumable upload that only holds one chunk in memory at a time
+                blob.chunk_size = UPLOAD_CHUNK_SIZE
+                blob.upload_from_file(
+                    file.stream,
+                    rewind=True,
+                    size=_file_size(file),
+                    content_type=file.content_type
+                )
+            
+            # Record the path so lookups by ID don't have to list the bucket
+            self.store_image_path(image_id, storage_path)
+            
+            # Sign a URL for temporary access; the path is new, so there is no cached one to look up
+            signed_url = self._sign_url(storage_path, blob)
+            
+            logger.info(f"Successfully uploaded image {image_id} to {storage_path}")
+            
+            return {
+                "id": image_id,
+                "filename": original_filename,
+                "storage_path": storage_path,
+                "url": signed_url,
+                "content_type": file.content_type
+            }
+            
+        except Exception as e:
+            logger.error(f"Error uploading file {file.filename}: {str(e)}")
+            return None
         
     def get_image_url(self, image_id: str) -> Optional[str]:
         """
@@ -186,65 +431,61 @@ class ImageStorageService:
                     logger.info(f"Using fallback URL for stock media {image_id}: {fallback_url}")
                     return fallback_url
             
-            # Use different prefix based on whether it's stock media or user uploads
+            # Images uploaded through upload_images have their path recorded in Redis
+            indexed_path = self.get_image_path(image_id)
+            if indexed_path:
+                url = self.get_signed_url(indexed_path)
+                logger.info(f"Found image {image_id} at indexed path {indexed_path}")
+                return url
+            
+            # Use different locations based on whether it's stock media or user uploads.
+            # Patterns with ** are matched by GCS (match_glob); the rest are exact blob paths.
             if is_stock_media:
                 logger.info(f"Searching for stock media with ID: {image_id}")
+                stock_name = image_id[6:]
                 # Look in both user_uploads and stock-media directories
                 search_locations = [
-                    f"user_uploads/images/**/{image_id}",  # First check traditional location
-                    f"stock-media/images/**/{image_id}",   # Then check stock media location
-                    f"stock-media/images/{image_id[6:]}.jpg",  # Try direct path with ID minus prefix
-                    f"stock-media/{image_id[6:]}.jpg",     # Try another common path
+                    f"user_uploads/images/**/*{stock_name}*",  # First check traditional location
+                    f"stock-media/images/**/*{stock_name}*",   # Then check stock media location
+                    f"stock-media/images/{stock_name}.jpg",    # Try direct path with ID minus prefix
+                    f"stock-media/{stock_name}.jpg",           # Try another common path
                 ]
             else:
                 # For regular user uploads, just use the standard path
-                search_locations = [f"{self.image_folder}/**/{image_id}"]
+                search_locations = [f"{self.image_folder}/**/*{image_id}*"]
                 
-            logger.info(f"Searching for image with ID: {image_id} using prefix: {search_locations[0]}")
+            logger.info(f"Searching for image with ID: {image_id} using pattern: {search_locations[0]}")
             
             # Try each search location
             for location in search_locations:
                 logger.info(f"Checking location: {location}")
                 
-                # For direct file check, verify if the blob exists
-                if not location.endswith("**/" + image_id):
+                # For direct file check, verify if the blob exists without listing
+                if "**" not in location:
                     try:
                         direct_blob = self.bucket.blob(location)
                         if direct_blob.exists():
-                            url = direct_blob.generate_signed_url(
-                                version="v4",
-                                expiration=timedelta(days=1),
-                                method="GET"
-                            )
+                            url = self.get_signed_url(location, direct_blob)
                             logger.info(f"Found image {image_id} at direct path {location}")
                             return url
                     except Exception as e:
                         logger.debug(f"Error checking direct path {location}: {str(e)}")
+                    continue
                 
-                # Otherwise do a prefix search
-                prefix = location.split("**/")[0] if "**/" in location else location.rsplit('/', 1)[0]
-                
-                # List blobs that might contain this image ID
+                # Otherwise let GCS match the pattern under its literal prefix and return the first hit
                 blobs = self.client.list_blobs(
                     self.bucket_name,
-                    prefix=prefix
+                    prefix=location.split("**")[0],
+                    match_glob=location,
+                    max_results=1,
+                    fields=LIST_BLOB_FIELDS
                 )
+                matching_blob = next(iter(blobs), None)
                 
-                # Find the first blob that contains the image ID in its name or metadata
-                matching_blobs = [blob for blob in blobs if 
-                                  (is_stock_media and (image_id in blob.name or image_id[6:] in blob.name)) or
-                                  (not is_stock_media and image_id in blob.name) or
-                                  (blob.metadata and 'image_id' in blob.metadata and blob.metadata['image_id'] == image_id)]
-                
-                if matching_blobs:
-                    matching_blob = matching_blobs[0]
-                    # Generate a signed URL
-                    url = matching_blob.generate_signed_url(
-                        version="v4",
-                        expiration=timedelta(days=1),
-                        method="GET"
-                    )
+                if matching_blob is not None:
+                    url = self.get_signed_url(matching_blob.name, matching_blob)
                     logger.info(f"Found image {image_id} at {matching_blob.name}")
+                    self.store_image_path(image_id, matching_blob.name)
                     return url
             
             logger.warning(f"No image found with ID {image_id}")
@@ -265,18 +506,36 @@ class ImageStorageService:
             bool: True if deletion was successful
         """
         try:
-            # List blobs with prefix
+            # Delete directly if the path was recorded at upload
+            indexed_path = self.get_image_path(image_id)
+            if indexed_path:
+                try:
+                    self.bucket.blob(indexed_path).delete()
+                    self.forget_image_path(image_id)
+                    self.forget_signed_url(indexed_path)
+                    logger.info(f"Successfully deleted image with ID {image_id}")
+                    return True
+                except NotFound:
+                    # Stale entry, fall back to searching the bucket
+                    logger.warning(f"Indexed path {indexed_path} for image {image_id} no longer exists")
+                    self.forget_image_path(image_id)
+                    self.forget_signed_url(indexed_path)
+            
+            # List blobs with prefix, fetching only their names
             blobs = self.client.list_blobs(
                 self.bucket_name,
-                prefix=self.image_folder
+                prefix=self.image_folder,
+                fields=LIST_BLOB_FIELDS
             )
             
-            # Find and delete the image
-            for blob in blobs:
-                if image_id in blob.name:
-                    blob.delete()
-                    logger.info(f"Successfully deleted image with ID {image_id}")
-                    return True
+            # Find and delete the image, stopping at the first match
+            blob = next((blob for blob in blobs if image_id in blob.name), None)
+            if blob is not None:
+                blob.delete()
+                self.forget_image_path(image_id)
+                self.forget_signed_url(blob.name)
+                logger.info(f"Successfully deleted image with ID {image_id}")
+                return True
             
             logger.warning(f"No image found with ID {image_id}")
             return False
@@ -284,6 +543,71 @@ class ImageStorageService:
         except Exception as e:
             logger.error(f"Error deleting image with ID {image_id}: {str(e)}")
             return False
+            
+    def _blob_deleted(self, path: str) -> bool:
+        """
+        Check that a blob no longer exists, treating errors as "still there"
+        
+        Args:
+            path: Path of the blob in the bucket
+            
+        Returns:
+            bool: True if the blob is confirmed gone
+        """
+        try:
+            return not self.bucket.blob(path).exists()
+        except Exception as e:
+            logger.error(f"Error checking whether {path} was deleted: {str(e)}")
+            return False
+            
+    def delete_images(self, image_ids: List[str]) -> Dict[str, bool]:
+        """
+        Delete several images from Google Cloud Storage.
+        
+        Images with a recorded path are deleted in batch requests of up to
+        DELETE_BATCH_SIZE calls; the rest, and any the batch could not delete,
+        go through delete_image one by one.
+        
+        Args:
+            image_ids: IDs of the images to delete
+            
+        Returns:
+            Dict[str, bool]: Whether each image was deleted, keyed by ID
+        """
+        results = {}
+        
+        indexed = []
+        for image_id in image_ids:
+            indexed_path = self.get_image_path(image_id)
+            if indexed_path:
+                indexed.append((image_id, indexed_path))
+        
+        for start in range(0, len(indexed), DELETE_BATCH_SIZE):
+            chunk = indexed[start:start + DELETE_BATCH_SIZE]
+            try:
+                with self.client.batch():
+                    for _, path in chunk:
+                        self.bucket.blob(path).delete()
+                deleted = chunk
+            except Exception as e:
+                # A failed batch only raises for its last failed call, so check which blobs are gone.
+                # A blob that is gone counts as deleted whether this batch or an earlier delete removed it.
+                logger.warning(f"Batch deleting {len(chunk)} images failed, checking which were deleted: {str(e)}")
+                deleted = [(image_id, path) for image_id, path in chunk if self._blob_deleted(path)]
+            
+            for image_id, path in deleted:
+                results[image_id] = True
+                self.forget_image_path(image_id)
+                self.forget_signed_url(path)
+        
+        logger.info(f"Batch deleted {len(results)} of {len(image_ids)} images")
+        
+        # Anything not deleted in a batch falls back to the single-image path
+        for image_id in image_ids:
+            if image_id not in results:
+                results[image_id] = self.delete_image(image_id)
+        
+        return results
 
 # Create a singleton instance
 image_storage_service = ImageStorageService() 
\ No newline at end of file
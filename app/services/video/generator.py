@@ -17,7 +17,7 @@ import shutil
 import tempfile
 import psutil
 import requests
-import openai
+from ..openai_client import get_openai_client
 from moviepy.video.VideoClip import ColorClip
 import time
 import sys
@@ -53,18 +53,12 @@ class VideoGenerator:
 
     def __init__(self):
         """Initialize the VideoGenerator service."""
-        self._openai_client = None
         logger.info("VideoGenerator initialized")
 
     @property
     def openai_client(self):
-        """Lazy initialization of OpenAI client."""
-        if self._openai_client is None:
-            api_key = os.getenv('OPENAI_API_KEY')
-            if not api_key:
-                raise ValueError("OPENAI_API_KEY environment variable is not set")
-            self._openai_client = openai.OpenAI(api_key=api_key)
-        return self._openai_client
+        """Shared OpenAI client, created on first use."""
+        return get_openai_client()
 
     def update_job_status(self, redis_client: Redis, job_id: str, status: str, progress: int = None, video_url: str = None, error: str = None) -> None:
         """Update job status in Redis."""
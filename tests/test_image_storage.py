@@ -67,7 +67,8 @@ async def test_image_storage_service_upload():
         
         # Verify the blob was created and uploaded
         assert mock_bucket.blob.call_count == 2
-        mock_blob.upload_from_file.assert_called()
+        mock_blob.upload_from_string.assert_any_call(b"test image content 1", content_type="image/jpeg")
+        mock_blob.upload_from_string.assert_any_call(b"test image content 2", content_type="image/png")
         mock_blob.generate_signed_url.assert_called()
 
 @pytest.mark.asyncio
@@ -106,7 +107,13 @@ async def test_image_storage_service_get_url():
         
         # Verify the results
         assert url == "https://storage.example.com/test-image-id-1.jpg"
-        mock_client.list_blobs.assert_called_once_with("test-bucket", prefix=image_storage.image_folder)
+        mock_client.list_blobs.assert_called_once_with(
+            "test-bucket",
+            prefix=f"{image_storage.image_folder}/",
+            match_glob=f"{image_storage.image_folder}/**/*test-image-id-1*",
+            max_results=1,
+            fields="items(name),nextPageToken"
+        )
 
 @pytest.mark.asyncio
 async def test_image_storage_service_delete():
@@ -120,6 +127,8 @@ async def test_image_storage_service_delete():
     # Create mock blobs
     mock_blob1 = MagicMock(name="user_uploads/images/2024/03/17/test-user/test-image-id-1.jpg")
     mock_blob2 = MagicMock(name="user_uploads/images/2024/03/17/test-user/test-image-id-2.png")
+    mock_blob1.name = "user_uploads/images/2024/03/17/test-user/test-image-id-1.jpg"
+    mock_blob2.name = "user_uploads/images/2024/03/17/test-user/test-image-id-2.png"
     
     # Configure the mocks
     mock_client.bucket.return_value = mock_bucket
@@ -142,6 +151,280 @@ async def test_image_storage_service_delete():
         
         # Verify the results
         assert result is True
-        mock_client.list_blobs.assert_called_once_with("test-bucket", prefix=image_storage.image_folder)
+        mock_client.list_blobs.assert_called_once_with(
+            "test-bucket", prefix=image_storage.image_folder, fields="items(name),nextPageToken"
+        )
         mock_blob1.delete.assert_called_once()
-        assert not mock_blob2.delete.called 
\ No newline at end of file
+        assert not mock_blob2.delete.called 
+@pytest.mark.asyncio
+async def test_image_storage_service_indexed_path():
+    """Test that get_image_url and delete_image use the image path index instead of listing."""
+    from app.services.storage.image_storage import ImageStorageService
+    
+    # Mock the GCS client and bucket
+    mock_client = MagicMock(spec=Client)
+    mock_bucket = MagicMock(spec=Bucket)
+    mock_blob = MagicMock(spec=Blob)
+    
+    # Configure the mocks
+    mock_client.bucket.return_value = mock_bucket
+    mock_bucket.blob.return_value = mock_blob
+    mock_blob.generate_signed_url.return_value = "https://storage.example.com/test-image-id-1.jpg"
+    storage_path = "user_uploads/images/2024/03/17/test-user/test-image-id-1.jpg"
+    
+    # Create a test instance with mocked components
+    with patch('app.services.video.storage.StorageService') as mock_storage_service:
+        # Configure the mock storage service
+        mock_storage_service_instance = MagicMock()
+        mock_storage_service_instance.client = mock_client
+        mock_storage_service_instance.bucket = mock_bucket
+        mock_storage_service_instance.bucket_name = "test-bucket"
+        mock_storage_service.return_value = mock_storage_service_instance
+        
+        # Create the image storage service with a mocked Redis index
+        image_storage = ImageStorageService()
+        redis_values = {"image_path:test-image-id-1": storage_path.encode("utf-8")}
+        image_storage.redis_client = MagicMock()
+        image_storage.redis_client.get.side_effect = redis_values.get
+        
+        # Test getting image URL
+        url = image_storage.get_image_url("test-image-id-1")
+        assert url == "https://storage.example.com/test-image-id-1.jpg"
+        mock_bucket.blob.assert_called_with(storage_path)
+        
+        # The signed URL is cached, so a second lookup doesn't sign again
+        image_storage.redis_client.setex.assert_called_once_with(
+            f"signed_url:{storage_path}", timedelta(hours=23).total_seconds(), url
+        )
+        redis_values[f"signed_url:{storage_path}"] = url.encode("utf-8")
+        assert image_storage.get_image_url("test-image-id-1") == url
+        mock_blob.generate_signed_url.assert_called_once()
+        
+        # Test deleting the image
+        assert image_storage.delete_image("test-image-id-1") is True
+        mock_blob.delete.assert_called_once()
+        image_storage.redis_client.delete.assert_any_call("image_path:test-image-id-1")
+        image_storage.redis_client.delete.assert_any_call(f"signed_url:{storage_path}")
+        
+        # Neither call should list the bucket
+        mock_client.list_blobs.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_image_storage_service_delete_images():
+    """Test that delete_images batches indexed deletions and searches for the rest."""
+    from app.services.storage.image_storage import ImageStorageService
+    
+    # Mock the GCS client and bucket
+    mock_client = MagicMock(spec=Client)
+    mock_bucket = MagicMock(spec=Bucket)
+    
+    # Configure the mocks
+    mock_client.bucket.return_value = mock_bucket
+    mock_client.list_blobs.return_value = []
+    
+    # Create a test instance with mocked components
+    with patch('app.services.video.storage.StorageService') as mock_storage_service:
+        # Configure the mock storage service
+        mock_storage_service_instance = MagicMock()
+        mock_storage_service_instance.client = mock_client
+        mock_storage_service_instance.bucket = mock_bucket
+        mock_storage_service_instance.bucket_name = "test-bucket"
+        mock_storage_service.return_value = mock_storage_service_instance
+        
+        # Create the image storage service with a mocked Redis index
+        image_storage = ImageStorageService()
+        image_storage.redis_client = MagicMock()
+        redis_values = {
+            "image_path:image-1": b"user_uploads/images/2024/03/17/test-user/image-1.jpg",
+            "image_path:image-2": b"user_uploads/images/2024/03/17/test-user/image-2.jpg",
+        }
+        image_storage.redis_client.get.side_effect = redis_values.get
+        image_storage.redis_client.delete.side_effect = lambda key: redis_values.pop(key, None)
+        
+        # image-1 and image-2 are deleted in one batch and image-3 is not indexed
+        result = image_storage.delete_images(["image-1", "image-2", "image-3"])
+        
+        # Verify the results
+        assert result == {"image-1": True, "image-2": True, "image-3": False}
+        mock_client.batch.assert_called_once_with()
+        assert mock_bucket.blob.return_value.delete.call_count == 2
+        mock_bucket.blob.return_value.exists.assert_not_called()
+        image_storage.redis_client.delete.assert_any_call("image_path:image-1")
+        image_storage.redis_client.delete.assert_any_call("image_path:image-2")
+        image_storage.redis_client.delete.assert_any_call(
+            "signed_url:user_uploads/images/2024/03/17/test-user/image-1.jpg"
+        )
+        assert mock_client.list_blobs.call_count == 1
+
+@pytest.mark.asyncio
+async def test_image_storage_service_delete_images_failed_batch():
+    """Test that images a failed batch did not delete fall back to delete_image."""
+    from google.api_core.exceptions import ServiceUnavailable
+    from app.services.storage.image_storage import ImageStorageService
+    
+    # Mock the GCS client and bucket
+    mock_client = MagicMock(spec=Client)
+    mock_bucket = MagicMock(spec=Bucket)
+    blobs = {
+        "user_uploads/images/2024/03/17/test-user/image-1.jpg": MagicMock(spec=Blob),
+        "user_uploads/images/2024/03/17/test-user/image-2.jpg": MagicMock(spec=Blob),
+        "user_uploads/images/2024/03/17/test-user/image-3.jpg": MagicMock(spec=Blob),
+    }
+    
+    # The batch reports one failure; image-1 is gone, image-2 still exists and image-3 is
+    # gone too, as it was deleted before the batch ran
+    mock_client.bucket.return_value = mock_bucket
+    mock_bucket.blob.side_effect = blobs.get
+    mock_client.batch.return_value.__exit__.side_effect = ServiceUnavailable("Backend error")
+    blobs["user_uploads/images/2024/03/17/test-user/image-1.jpg"].exists.return_value = False
+    blobs["user_uploads/images/2024/03/17/test-user/image-2.jpg"].exists.return_value = True
+    blobs["user_uploads/images/2024/03/17/test-user/image-3.jpg"].exists.return_value = False
+    
+    # Create a test instance with mocked components
+    with patch('app.services.video.storage.StorageService') as mock_storage_service:
+        # Configure the mock storage service
+        mock_storage_service_instance = MagicMock()
+        mock_storage_service_instance.client = mock_client
+        mock_storage_service_instance.bucket = mock_bucket
+        mock_storage_service_instance.bucket_name = "test-bucket"
+        mock_storage_service.return_value = mock_storage_service_instance
+        
+        # Create the image storage service with a mocked Redis index
+        image_storage = ImageStorageService()
+        image_storage.redis_client = MagicMock()
+        redis_values = {f"image_path:{path.rsplit('/', 1)[1][:-4]}": path.encode("utf-8") for path in blobs}
+        image_storage.redis_client.get.side_effect = redis_values.get
+        image_storage.redis_client.delete.side_effect = lambda key: redis_values.pop(key, None)
+        
+        result = image_storage.delete_images(["image-1", "image-2", "image-3"])
+        
+        # image-2 is retried on its own and deleted then
+        assert result == {"image-1": True, "image-2": True, "image-3": True}
+        assert blobs["user_uploads/images/2024/03/17/test-user/image-2.jpg"].delete.call_count == 2
+        mock_client.list_blobs.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_image_storage_service_upload_large_file():
+    """Test that files above the simple upload size are streamed in chunks."""
+    from app.services.storage import image_storage as image_storage_module
+    from app.services.storage.image_storage import ImageStorageService
+    
+    content = b"large image content"
+    test_image = FileStorage(
+        stream=io.BytesIO(content),
+        filename="large.jpg",
+        content_type="image/jpeg"
+    )
+    
+    # Mock the GCS client and bucket
+    mock_client = MagicMock(spec=Client)
+    mock_bucket = MagicMock(spec=Bucket)
+    mock_blob = MagicMock(spec=Blob)
+    
+    # Configure the mocks
+    mock_client.bucket.return_value = mock_bucket
+    mock_bucket.blob.return_value = mock_blob
+    mock_blob.generate_signed_url.return_value = "https://storage.example.com/test-signed-url"
+    
+    # Create a test instance with mocked components
+    with patch('app.services.video.storage.StorageService') as mock_storage_service, \
+            patch.object(image_storage_module, "SIMPLE_UPLOAD_MAX_SIZE", len(content) - 1):
+        # Configure the mock storage service
+        mock_storage_service_instance = MagicMock()
+        mock_storage_service_instance.client = mock_client
+        mock_storage_service_instance.bucket = mock_bucket
+        mock_storage_service_instance.bucket_name = "test-bucket"
+        mock_storage_service.return_value = mock_storage_service_instance
+        
+        # Create the image storage service
+        image_storage = ImageStorageService()
+        result = image_storage.upload_images([test_image], "test-user-123")
+        
+        # Verify the file was streamed rather than read into memory
+        assert len(result) == 1
+        assert mock_blob.chunk_size == image_storage_module.UPLOAD_CHUNK_SIZE
+        mock_blob.upload_from_file.assert_called_once_with(
+            test_image.stream, rewind=True, size=len(content), content_type="image/jpeg"
+        )
+        mock_blob.upload_from_string.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_image_storage_service_redis_cooldown():
+    """Test that Redis has short timeouts and is skipped for a while after a connection failure."""
+    import redis
+    from app.services.response_cache import REDIS_SOCKET_TIMEOUT
+    from app.services.storage.image_storage import ImageStorageService
+    
+    # Mock the GCS client and bucket
+    mock_client = MagicMock(spec=Client)
+    mock_bucket = MagicMock(spec=Bucket)
+    mock_client.bucket.return_value = mock_bucket
+    
+    # Create a test instance with mocked components
+    with patch('app.services.video.storage.StorageService') as mock_storage_service:
+        # Configure the mock storage service
+        mock_storage_service_instance = MagicMock()
+        mock_storage_service_instance.client = mock_client
+        mock_storage_service_instance.bucket = mock_bucket
+        mock_storage_service_instance.bucket_name = "test-bucket"
+        mock_storage_service.return_value = mock_storage_service_instance
+        
+        # Create the image storage service
+        image_storage = ImageStorageService()
+        connection_kwargs = image_storage.redis_client.connection_pool.connection_kwargs
+        assert connection_kwargs["socket_timeout"] == REDIS_SOCKET_TIMEOUT
+        assert connection_kwargs["socket_connect_timeout"] == REDIS_SOCKET_TIMEOUT
+        
+        # An unreachable Redis is called once, then skipped
+        image_storage.redis_client = MagicMock()
+        image_storage.redis_client.get.side_effect = redis.ConnectionError("Connection refused")
+        assert image_storage.get_image_path("image-1") is None
+        assert image_storage.get_image_path("image-2") is None
+        assert image_storage.store_image_path("image-3", "user_uploads/images/image-3.jpg") is False
+        image_storage.forget_image_path("image-1")
+        
+        image_storage.redis_client.get.assert_called_once()
+        image_storage.redis_client.setex.assert_not_called()
+        image_storage.redis_client.delete.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_image_storage_service_upload_signs_without_cache_lookup():
+    """Test that uploads sign and cache a URL without looking one up for the new path."""
+    from app.services.storage.image_storage import ImageStorageService
+    
+    test_image = FileStorage(
+        stream=io.BytesIO(b"test image content"),
+        filename="test.jpg",
+        content_type="image/jpeg"
+    )
+    
+    # Mock the GCS client and bucket
+    mock_client = MagicMock(spec=Client)
+    mock_bucket = MagicMock(spec=Bucket)
+    mock_blob = MagicMock(spec=Blob)
+    
+    # Configure the mocks
+    mock_client.bucket.return_value = mock_bucket
+    mock_bucket.blob.return_value = mock_blob
+    mock_blob.generate_signed_url.return_value = "https://storage.example.com/test-signed-url"
+    
+    # Create a test instance with mocked components
+    with patch('app.services.video.storage.StorageService') as mock_storage_service:
+        # Configure the mock storage service
+        mock_storage_service_instance = MagicMock()
+        mock_storage_service_instance.client = mock_client
+        mock_storage_service_instance.bucket = mock_bucket
+        mock_storage_service_instance.bucket_name = "test-bucket"
+        mock_storage_service.return_value = mock_storage_service_instance
+        
+        # Create the image storage service with a mocked Redis
+        image_storage = ImageStorageService()
+        image_storage.redis_client = MagicMock()
+        result = image_storage.upload_images([test_image], "test-user-123")
+        
+        # The URL is cached under the new path, which is never read
+        storage_path = result[0]["storage_path"]
+        image_storage.redis_client.get.assert_not_called()
+        image_storage.redis_client.setex.assert_any_call(
+            f"signed_url:{storage_path}", timedelta(hours=23).total_seconds(), result[0]["url"]
+        )
@@ -93,7 +93,7 @@ def test_file_validator():
     
     # Create test files
     valid_image = FileStorage(
-        stream=io.BytesIO(b"valid image content"),
+        stream=io.BytesIO(b"\xff\xd8\xff\xe0valid image content"),
         filename="valid.jpg",
         content_type="image/jpeg"
     )
@@ -111,22 +111,63 @@ def test_file_validator():
         allowed_types=['image/jpeg', 'image/png']
     )
     
-    # Test valid file
-    with patch('magic.from_buffer', return_value='image/jpeg'):
+    # Image types are identified by their signature, without libmagic
+    with patch('magic.from_buffer') as mock_from_buffer:
+        # Test valid file
         is_valid, result = validator.validate_files([valid_image])
         assert is_valid is True
         assert "successfully" in result["message"].lower()
-    
-    # Test invalid file type
-    with patch('magic.from_buffer', return_value='application/octet-stream'):
+        assert result["file_data"] == [b"\xff\xd8\xff\xe0valid image content"]
+        
+        # Test invalid file type
         is_valid, result = validator.validate_files([invalid_type])
         assert is_valid is False
         assert "error" in result
         assert isinstance(result["error"], list) or isinstance(result["error"], str)
         
+        mock_from_buffer.assert_not_called()
+        
     # Test too many files
     too_many = [valid_image] * 3  # 3 files when max is 2
-    with patch('magic.from_buffer', return_value='image/jpeg'):
-        is_valid, result = validator.validate_files(too_many)
-        assert is_valid is False
-        assert "error" in result 
\ No newline at end of file
+    is_valid, result = validator.validate_files(too_many)
+    assert is_valid is False
+    assert "error" in result
+    
+    # Types without a known signature still go through libmagic
+    pdf_validator = FileValidator(allowed_types=['image/jpeg', 'application/pdf'])
+    pdf_file = FileStorage(
+        stream=io.BytesIO(b"%PDF-1.4 content"),
+        filename="doc.pdf",
+        content_type="application/pdf"
+    )
+    with patch('magic.from_buffer', return_value='application/pdf'):
+        is_valid, result = pdf_validator.validate_files([pdf_file])
+        assert is_valid is True
+
+def test_file_validator_spooled_upload_size():
+    """Test that upload sizes are read from Werkzeug's spooled temporary files."""
+    from app.services.storage.file_validator import FileValidator
+    
+    content = b"\xff\xd8\xff\xe0" + b"x" * 1000
+    validator = FileValidator(allowed_types=['image/jpeg'])
+    
+    # In-memory upload: measured without rolling it over to disk
+    in_memory = tempfile.SpooledTemporaryFile(max_size=4096)
+    in_memory.write(content)
+    in_memory.seek(0)
+    in_memory_upload = FileStorage(stream=in_memory, filename="small.jpg", content_type="image/jpeg")
+    with patch.object(in_memory, 'rollover', wraps=in_memory.rollover) as mock_rollover:
+        assert validator._stream_size(in_memory_upload) == len(content)
+        mock_rollover.assert_not_called()
+    
+    # Rolled over upload
+    on_disk = tempfile.SpooledTemporaryFile(max_size=16)
+    on_disk.write(content)
+    on_disk.seek(0)
+    on_disk_upload = FileStorage(stream=on_disk, filename="large.jpg", content_type="image/jpeg")
+    assert validator._stream_size(on_disk_upload) == len(content)
+    
+    # Both still validate and read from the start
+    is_valid, result = validator.validate_files([in_memory_upload, on_disk_upload])
+    assert is_valid is True
+    assert result["file_data"] == [content, content]
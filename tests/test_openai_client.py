@@ -0,0 +1,27 @@
+import pytest
+import os
+import asyncio
+
+os.environ.setdefault('OPENAI_API_KEY', 'test-openai-key')
+
+def test_async_client_per_event_loop():
+    """Test that each event loop gets its own async client, reused within the loop."""
+    from app.services.openai_client import get_async_openai_client, _async_openai_clients
+    
+    async def get_twice():
+        return get_async_openai_client(), get_async_openai_client()
+    
+    first, first_again = asyncio.run(get_twice())
+    second, _ = asyncio.run(get_twice())
+    
+    assert first is first_again
+    assert second is not first
+    # The client of the first, now closed, loop was dropped
+    assert first not in _async_openai_clients.values()
+
+def test_async_client_requires_running_loop():
+    """Test that the async client can't be created outside an event loop."""
+    from app.services.openai_client import get_async_openai_client
+    
+    with pytest.raises(RuntimeError):
+        get_async_openai_client()
@@ -0,0 +1,251 @@
+import pytest
+import os
+from unittest.mock import patch, MagicMock
+
+os.environ.setdefault('OPENAI_API_KEY', 'test-openai-key')
+
+def _service(mock_client):
+    """Create an OpenAIService whose sync client is the given mock."""
+    from app.services.openai import OpenAIService
+    
+    service = OpenAIService()
+    mock_client.with_options.return_value = mock_client
+    service.client = mock_client
+    return service
+
+def _completion(content):
+    """Build a mock chat completion response with the given message content."""
+    response = MagicMock()
+    response.choices[0].message.content = content
+    return response
+
+def test_create_completion_retries_transient_errors():
+    """Test that connection errors are retried and the SDK's own retries are disabled."""
+    from openai import APIConnectionError
+    
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.side_effect = [
+        APIConnectionError(request=MagicMock()),
+        _completion("ok")
+    ]
+    service = _service(mock_client)
+    
+    with patch('app.services.openai.time.sleep') as mock_sleep:
+        response = service._create_completion(model="gpt-3.5-turbo", messages=[])
+    
+    assert response.choices[0].message.content == "ok"
+    assert mock_client.chat.completions.create.call_count == 2
+    mock_client.with_options.assert_called_once_with(max_retries=0)
+    mock_sleep.assert_called_once()
+
+def test_create_completion_does_not_retry_client_errors():
+    """Test that a 400 error is raised without retrying."""
+    from openai import BadRequestError
+    
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.side_effect = BadRequestError(
+        "bad request", response=MagicMock(status_code=400), body=None
+    )
+    service = _service(mock_client)
+    
+    with patch('app.services.openai.time.sleep') as mock_sleep:
+        with pytest.raises(BadRequestError):
+            service._create_completion(model="gpt-3.5-turbo", messages=[])
+    
+    assert mock_client.chat.completions.create.call_count == 1
+    mock_sleep.assert_not_called()
+
+def test_analyze_content_retries_transient_error():
+    """Test that analyze_content retries a transient error and returns the analysis."""
+    from openai import APIConnectionError
+    
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.side_effect = [
+        APIConnectionError(request=MagicMock()),
+        _completion('{"keywords": ["leadership"], "sentiment": "positive", "topics": [], "entities": []}')
+    ]
+    service = _service(mock_client)
+    
+    with patch('app.services.openai.time.sleep'):
+        result = service.analyze_content("Leadership lessons from building remote teams")
+    
+    assert result["success"] is True
+    assert result["data"]["sentiment"] == "positive"
+    assert result["data"]["keywords"][0] == "leadership"
+    assert mock_client.chat.completions.create.call_count == 2
+
+def test_generate_post_is_not_cached():
+    """Test that sampled posts are regenerated rather than served from the response cache."""
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.side_effect = [_completion("First post"), _completion("Second post")]
+    service = _service(mock_client)
+    
+    with patch('app.services.response_cache.response_cache_enabled', return_value=True), \
+         patch('app.services.response_cache.get_redis_client') as mock_redis:
+        first = service.generate_post("Leadership", "Professional", "Managers", 500)
+        second = service.generate_post("Leadership", "Professional", "Managers", 500)
+    
+    assert first["data"]["content"] == "First post"
+    assert second["data"]["content"] == "Second post"
+    assert mock_client.chat.completions.create.call_count == 2
+    mock_redis.return_value.setex.assert_not_called()
+
+def test_analyze_content_ignores_non_string_keywords():
+    """Test that nested keywords from the model don't turn a valid analysis into an error."""
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.return_value = _completion(
+        '{"keywords": ["leadership", ["remote", "teams"], {"name": "hiring"}], "sentiment": "neutral", "topics": [], "entities": []}'
+    )
+    service = _service(mock_client)
+    
+    result = service.analyze_content("Leadership lessons from building remote teams")
+    
+    assert result["success"] is True
+    assert result["data"]["keywords"][0] == "leadership"
+    assert all(isinstance(keyword, str) for keyword in result["data"]["keywords"])
+    assert "remote" in result["data"]["keywords"]
+
+def test_generate_post_async_across_event_loops():
+    """Test that async generation keeps working when each batch runs in a new event loop."""
+    import asyncio
+    from unittest.mock import AsyncMock
+    
+    mock_async_client = MagicMock()
+    mock_async_client.with_options.return_value = mock_async_client
+    
+    async def create(**request):
+        await asyncio.sleep(0)
+        return _completion("Async post")
+    mock_async_client.chat.completions.create = AsyncMock(side_effect=create)
+    service = _service(MagicMock())
+    specs = [{"theme": "Leadership", "tone": "Professional", "target_audience": "Managers", "length": 500}] * 2
+    
+    # One slot makes the two posts contend for the semaphore in every loop
+    with patch('app.services.openai.get_async_openai_client', return_value=mock_async_client), \
+         patch('app.services.openai.OPENAI_MAX_CONCURRENCY', 1):
+        first = asyncio.run(service.generate_posts_batch(specs))
+        second = asyncio.run(service.generate_posts_batch(specs))
+    
+    assert all(result["success"] for result in first + second)
+    assert mock_async_client.chat.completions.create.call_count == 4
+
+def test_analyze_contents_groups_posts_into_one_request():
+    """Test that several posts are analyzed with a single chat completion and returned in order."""
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.return_value = _completion(
+        '{"analyses": {"0": {"keywords": ["hiring"], "sentiment": "positive", "topics": [], "entities": []},'
+        ' "2": {"keywords": ["remote"], "sentiment": "neutral", "topics": [], "entities": []}}}'
+    )
+    service = _service(mock_client)
+    
+    results = service.analyze_contents([
+        "Hiring engineers this quarter",
+        "Quarterly results announcement",
+        "Remote teams need clear writing"
+    ])
+    
+    assert mock_client.chat.completions.create.call_count == 1
+    assert results[0]["data"]["sentiment"] == "positive"
+    assert results[1]["success"] is False
+    assert results[2]["data"]["keywords"][0] == "remote"
+
+def test_analyze_content_batch_reads_batch_output():
+    """Test that Batch API results are matched back to their posts by custom_id."""
+    import json
+    
+    mock_client = MagicMock()
+    mock_client.batches.create.return_value.status = "in_progress"
+    mock_client.batches.retrieve.return_value.status = "completed"
+    mock_client.batches.retrieve.return_value.output_file_id = "file-out"
+    mock_client.files.content.return_value.text = json.dumps({
+        "custom_id": "1",
+        "response": {
+            "status_code": 200,
+            "body": {"choices": [{"message": {"content": '{"keywords": ["remote"], "sentiment": "neutral", "topics": [], "entities": []}'}}]}
+        }
+    })
+    service = _service(mock_client)
+    
+    with patch('app.services.openai.time.sleep') as mock_sleep:
+        results = service.analyze_content_batch(["Hiring engineers this quarter", "Remote teams need clear writing"])
+    
+    mock_sleep.assert_called_once()
+    assert mock_client.files.create.call_args[1]["purpose"] == "batch"
+    assert results[1]["data"]["sentiment"] == "neutral"
+    assert results[0]["success"] is False
+    assert "completed" in results[0]["error"]
+
+def test_generate_post_stream_stops_at_max_chars():
+    """Test that streaming generation is cut off and closed once the post reaches max_chars."""
+    chunks = []
+    for word in ["Leadership ", "is ", "a ", "practice, ", "not ", "a ", "title. "] * 10:
+        chunk = MagicMock()
+        chunk.choices[0].delta.content = word
+        chunks.append(chunk)
+    mock_stream = MagicMock()
+    mock_stream.__iter__.return_value = iter(chunks)
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.return_value = mock_stream
+    service = _service(mock_client)
+    
+    result = service.generate_post("Leadership", "Professional", "Managers", 500, max_chars=60)
+    
+    assert result["success"] is True
+    assert len(result["data"]["content"]) <= 60
+    mock_stream.close.assert_called_once()
+
+def test_analyze_content_serves_near_duplicates_from_semantic_cache():
+    """Test that content with a similar embedding reuses the earlier analysis."""
+    from app.services.semantic_cache import SemanticCache
+    
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.return_value = _completion(
+        '{"keywords": ["leadership"], "sentiment": "positive", "topics": [], "entities": []}'
+    )
+    embeddings = [[1.0, 0.0], [0.99, 0.14], [0.0, 1.0]]
+    mock_client.embeddings.create.side_effect = [
+        MagicMock(data=[MagicMock(embedding=embedding)]) for embedding in embeddings
+    ]
+    service = _service(mock_client)
+    service.analysis_cache = SemanticCache(dim=2)
+    
+    first = service.analyze_content("Leadership lessons from building remote teams")
+    near_duplicate = service.analyze_content("Leadership lessons from building remote teams!")
+    different = service.analyze_content("Quarterly results announcement")
+    
+    assert first["success"] and near_duplicate["success"] and different["success"]
+    assert near_duplicate["data"] == first["data"]
+    assert mock_client.chat.completions.create.call_count == 2
+
+def test_analyze_content_samples_breadcrumbs_per_call():
+    """Test that each analysis call keeps or drops its whole breadcrumb trail."""
+    import asyncio
+    from unittest.mock import AsyncMock
+    
+    reply = '{"keywords": ["leadership"], "sentiment": "positive", "topics": [], "entities": []}'
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.return_value = _completion(reply)
+    mock_async_client = MagicMock()
+    mock_async_client.with_options.return_value = mock_async_client
+    mock_async_client.chat.completions.create = AsyncMock(return_value=_completion(reply))
+    service = _service(mock_client)
+    
+    # One draw per call: sampled, not sampled, then sampled on the async path
+    with patch('app.services.openai.random.random', side_effect=[0.0, 0.99, 0.0]), \
+         patch('app.services.openai.get_async_openai_client', return_value=mock_async_client), \
+         patch('app.services.openai.sentry_sdk.add_breadcrumb') as mock_breadcrumb:
+        assert service.analyze_content("Leadership lessons from building remote teams")["success"]
+        sampled = [call.kwargs["message"] for call in mock_breadcrumb.call_args_list]
+        mock_breadcrumb.reset_mock()
+        
+        assert service.analyze_content("Leadership lessons from building remote teams")["success"]
+        assert mock_breadcrumb.call_count == 0
+        
+        assert asyncio.run(service.analyze_content_async("Leadership lessons from building remote teams"))["success"]
+        sampled_async = [call.kwargs["message"] for call in mock_breadcrumb.call_args_list]
+    
+    assert sampled[0] == "Starting content analysis"
+    assert sampled[-1] == "Content analysis completed successfully"
+    # Breadcrumbs from helpers run on the thread pool follow the call's decision
+    assert any(message.startswith("Extracted keywords") for message in sampled_async)
+    assert sampled_async[-1] == "Content analysis completed successfully"
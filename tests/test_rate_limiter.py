@@ -0,0 +1,82 @@
+import pytest
+import asyncio
+from unittest.mock import patch, MagicMock
+
+@pytest.fixture
+def clock():
+    """Fake monotonic clock for the rate limiter; sleeping advances it instead of waiting."""
+    from app.services import rate_limiter
+    
+    state = {"now": 0.0, "sleeps": []}
+    
+    async def fake_sleep(delay):
+        state["sleeps"].append(delay)
+        state["now"] += delay
+    
+    mock_time = MagicMock()
+    mock_time.monotonic.side_effect = lambda: state["now"]
+    mock_asyncio = MagicMock()
+    mock_asyncio.sleep = fake_sleep
+    with patch.object(rate_limiter, 'time', mock_time), \
+         patch.object(rate_limiter, 'asyncio', mock_asyncio):
+        yield state
+
+def test_requests_wait_for_oldest_to_leave_window(clock):
+    """Test that a request over the per-minute count waits until the oldest request is evicted."""
+    from app.services.rate_limiter import RateLimiter
+    
+    limiter = RateLimiter(max_requests_per_minute=2, max_tokens_per_minute=1000)
+    
+    async def run():
+        await limiter.acquire(10)
+        clock["now"] = 10.0
+        await limiter.acquire(10)
+        await limiter.acquire(10)
+    
+    asyncio.run(run())
+    
+    assert clock["sleeps"] == [50.0]
+    assert clock["now"] == 60.0
+    assert [timestamp for timestamp, _ in limiter._requests] == [10.0, 60.0]
+    assert limiter._tokens_in_window == 20
+
+def test_tokens_wait_for_window_room(clock):
+    """Test that a request over the token budget waits until enough tokens are evicted."""
+    from app.services.rate_limiter import RateLimiter
+    
+    limiter = RateLimiter(max_requests_per_minute=100, max_tokens_per_minute=100)
+    
+    async def run():
+        await limiter.acquire(80)
+        clock["now"] = 30.0
+        await limiter.acquire(50)
+    
+    asyncio.run(run())
+    
+    assert clock["sleeps"] == [30.0]
+    assert limiter._tokens_in_window == 50
+
+def test_prune_evicts_requests_outside_window():
+    """Test that requests older than the window stop counting against the limits."""
+    from app.services.rate_limiter import RateLimiter
+    
+    limiter = RateLimiter(max_requests_per_minute=10, max_tokens_per_minute=1000)
+    limiter._requests.extend([(0.0, 100), (30.0, 200), (59.0, 300)])
+    limiter._tokens_in_window = 600
+    
+    limiter._prune(60.0)
+    
+    assert len(limiter._requests) == 2
+    assert limiter._tokens_in_window == 500
+    assert limiter._wait_time(600, 60.0) == pytest.approx(30.0)
+
+def test_pause_holds_back_requests(clock):
+    """Test that requests wait out a pause set after a rate limit response."""
+    from app.services.rate_limiter import RateLimiter
+    
+    limiter = RateLimiter(max_requests_per_minute=100, max_tokens_per_minute=1000)
+    limiter.pause(5.0)
+    
+    asyncio.run(limiter.acquire(10))
+    
+    assert clock["sleeps"] == [5.0]
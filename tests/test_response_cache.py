@@ -0,0 +1,99 @@
+import pytest
+import redis
+from unittest.mock import patch, MagicMock
+
+@pytest.fixture
+def response_cache():
+    """Response cache module with caching enabled and empty local and Redis state."""
+    from app.services import response_cache
+    
+    response_cache._local_cache.clear()
+    with patch.object(response_cache, 'response_cache_enabled', return_value=True), \
+         patch.object(response_cache, '_redis_retry_at', 0.0):
+        yield response_cache
+    response_cache._local_cache.clear()
+
+def test_redis_client_has_short_timeouts(response_cache):
+    """Test that the Redis client is created with short socket timeouts."""
+    with patch.object(response_cache, '_redis_client', None), \
+         patch('redis.from_url') as mock_from_url:
+        response_cache.get_redis_client()
+    
+    _, kwargs = mock_from_url.call_args
+    assert kwargs["socket_connect_timeout"] == response_cache.REDIS_SOCKET_TIMEOUT
+    assert kwargs["socket_timeout"] == response_cache.REDIS_SOCKET_TIMEOUT
+
+def test_redis_skipped_after_connection_failure(response_cache):
+    """Test that Redis is not called again during the cooldown after a connection failure."""
+    mock_redis = MagicMock()
+    mock_redis.get.side_effect = redis.ConnectionError("Connection refused")
+    
+    with patch.object(response_cache, 'get_redis_client', return_value=mock_redis):
+        assert response_cache.get_cached_response("key-1") is None
+        assert response_cache.get_cached_response("key-2") is None
+        response_cache.set_cached_response("key-3", "value")
+    
+    assert mock_redis.get.call_count == 1
+    mock_redis.setex.assert_not_called()
+
+def test_async_lookup_runs_redis_off_event_loop(response_cache):
+    """Test that async cache calls make their Redis round trips off the event loop thread."""
+    import asyncio
+    import threading
+    
+    redis_threads = []
+    mock_redis = MagicMock()
+    mock_redis.get.side_effect = lambda key: redis_threads.append(threading.get_ident()) or b"cached"
+    mock_redis.setex.side_effect = lambda *args: redis_threads.append(threading.get_ident())
+    
+    async def lookup_and_store():
+        value = await response_cache.get_cached_response_async("key-1")
+        await response_cache.set_cached_response_async("key-2", "value")
+        return value, threading.get_ident()
+    
+    with patch.object(response_cache, 'get_redis_client', return_value=mock_redis):
+        value, loop_thread = asyncio.run(lookup_and_store())
+    
+    assert value == "cached"
+    assert len(redis_threads) == 2
+    assert loop_thread not in redis_threads
+
+def test_local_cache_serves_responses_while_redis_down(response_cache):
+    """Test that responses are still cached in-process when Redis cannot be reached."""
+    mock_redis = MagicMock()
+    mock_redis.setex.side_effect = redis.ConnectionError("Connection refused")
+    
+    with patch.object(response_cache, 'get_redis_client', return_value=mock_redis):
+        response_cache.set_cached_response("key-1", "value")
+        assert response_cache.get_cached_response("key-1") == "value"
+    
+    mock_redis.get.assert_not_called()
+
+def test_local_cache_evicts_least_recently_used(response_cache):
+    """Test that the in-process cache drops the least recently used entry when full."""
+    with patch.object(response_cache, 'LOCAL_CACHE_SIZE', 2), \
+         patch.object(response_cache, '_redis_available', return_value=False):
+        response_cache.set_cached_response("key-1", "one")
+        response_cache.set_cached_response("key-2", "two")
+        assert response_cache.get_cached_response("key-1") == "one"
+        response_cache.set_cached_response("key-3", "three")
+        
+        assert response_cache.get_cached_response("key-1") == "one"
+        assert response_cache.get_cached_response("key-2") is None
+        assert response_cache.get_cached_response("key-3") == "three"
+
+def test_local_cache_entries_expire(response_cache):
+    """Test that in-process entries are not served after their TTL."""
+    now = [1000.0]
+    mock_time = MagicMock()
+    mock_time.monotonic.side_effect = lambda: now[0]
+    
+    with patch.object(response_cache, 'time', mock_time), \
+         patch.object(response_cache, '_redis_available', return_value=False):
+        response_cache.set_cached_response("key-1", "value")
+        now[0] += response_cache.LOCAL_CACHE_TTL - 1
+        assert response_cache.get_cached_response("key-1") == "value"
+        now[0] += 2
+        assert response_cache.get_cached_response("key-1") is None
+    
+    assert "key-1" not in response_cache._local_cache
@@ -0,0 +1,41 @@
+import pytest
+import math
+
+def _at_similarity(similarity):
+    """Build a 2-d unit vector whose cosine similarity to [1, 0] is the given value."""
+    return [similarity, math.sqrt(1 - similarity ** 2)]
+
+@pytest.fixture
+def semantic_cache():
+    """Two-dimensional semantic cache holding one analysis under [1, 0]."""
+    from app.services.semantic_cache import SemanticCache
+    
+    cache = SemanticCache(threshold=0.92, max_entries=2, dim=2)
+    cache.add([1.0, 0.0], {"sentiment": "positive"})
+    return cache
+
+def test_lookup_hits_above_threshold(semantic_cache):
+    """Test that a near-duplicate embedding is served the stored value."""
+    assert semantic_cache.lookup(_at_similarity(0.95)) == {"sentiment": "positive"}
+    # Scale does not matter, only direction
+    assert semantic_cache.lookup([10.0, 0.0]) == {"sentiment": "positive"}
+
+def test_lookup_misses_below_threshold(semantic_cache):
+    """Test that an embedding less similar than the threshold is a miss."""
+    assert semantic_cache.lookup(_at_similarity(0.90)) is None
+    assert semantic_cache.lookup([0.0, 0.0]) is None
+
+def test_lookup_returns_copy(semantic_cache):
+    """Test that changing a returned value does not change the cached one."""
+    semantic_cache.lookup([1.0, 0.0])["sentiment"] = "negative"
+    
+    assert semantic_cache.lookup([1.0, 0.0]) == {"sentiment": "positive"}
+
+def test_full_cache_overwrites_oldest(semantic_cache):
+    """Test that adding to a full cache replaces the oldest entry."""
+    semantic_cache.add([0.0, 1.0], {"sentiment": "neutral"})
+    semantic_cache.add([-1.0, 0.0], {"sentiment": "negative"})
+    
+    assert semantic_cache.lookup([1.0, 0.0]) is None
+    assert semantic_cache.lookup([0.0, 1.0]) == {"sentiment": "neutral"}
+    assert semantic_cache.lookup([-1.0, 0.0]) == {"sentiment": "negative"}
@@ -0,0 +1,209 @@
+import pytest
+import json
+import re
+from unittest.mock import patch, MagicMock
+
+# clean_text as it was implemented before the regexes were precompiled
+BASELINE_URL_PATTERN = r'(?:https?:\/\/|www\.)?(?:[\w]+\.)+[\w]+(?:\/[\w\.\-?=&%]*)*'
+BASELINE_HASHTAG_PATTERN = r'#\w+'
+BASELINE_EMOJI_PATTERN = r'[\U0001F300-\U0001F9FF]|[\u2600-\u26FF\u2700-\u27BF]'
+
+def baseline_clean_text(text):
+    text = re.sub(BASELINE_URL_PATTERN, '', text)
+    text = re.sub(BASELINE_HASHTAG_PATTERN, '', text)
+    text = re.sub(BASELINE_EMOJI_PATTERN, '', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+@pytest.fixture
+def text_processor():
+    """TextProcessor with an empty clean_text cache."""
+    from app.services.media.text_processor import TextProcessor, _clean_text
+    
+    _clean_text.cache_clear()
+    return TextProcessor()
+
+@pytest.mark.parametrize("post", [
+    "Excited to share our new report 🚀 Read it at https://www.example.com/reports/2024?id=7&ref=li #AI #Leadership",
+    "Long tracking host: https://" + "a" * 80 + ".click.example.com/track?u=1 and a long slug " + "b" * 70 + ".example.org",
+    "Shipping v1.2 today, e.g. faster exports. Thanks team!\n\n\nMore soon ☀️ #Product",
+    "Tagged #foo.bar and site.com/#tag mid-sentence.",
+    "No links or tags here, just words and spaces   between them.",
+    "Slides:https://example.com/deck and notes at docs.example.com/notes, mirrored on xwww.example.org.",
+])
+def test_clean_text_matches_baseline(text_processor, post):
+    """Test that clean_text strips the same URLs, hashtags and emojis as the original regexes."""
+    assert text_processor.clean_text(post) == baseline_clean_text(post)
+
+@pytest.mark.parametrize("post", [
+    "a" * 20000 + ".",
+    ("word" * 5000 + ". ") * 3,
+    "Read more at https://" + "a" * 20000 + ".",
+], ids=["word-run", "long-words", "url-prefix"])
+def test_clean_text_is_linear_on_long_word_runs(text_processor, post):
+    """Test that a long run of word characters is scanned without quadratic backtracking."""
+    import time
+    
+    start = time.perf_counter()
+    cleaned = text_processor.clean_text(post)
+    elapsed = time.perf_counter() - start
+    
+    # The original pattern took over a second on each of these; none of them holds a URL
+    assert elapsed < 0.1
+    assert cleaned == post.strip()
+
+def _stream_chunk(content):
+    """Build a mock streamed chat completion chunk carrying the given text delta."""
+    chunk = MagicMock()
+    chunk.choices[0].delta.content = content
+    return chunk
+
+def test_rescale_segments_sums_to_target(text_processor):
+    """Test that segment durations are rescaled to sum to the requested total."""
+    segments = [
+        {"text": "Intro", "topic": "Intro", "key_points": [], "duration": 10.0},
+        {"text": "Body", "topic": "Body", "key_points": [], "duration": 20.0},
+        {"text": "Outro", "topic": "Outro", "key_points": [], "duration": 33.0},
+    ]
+    
+    rescaled = text_processor._rescale_segments(segments, 45.0)
+    
+    assert sum(segment["duration"] for segment in rescaled) == pytest.approx(45.0, abs=0.01 * len(segments))
+    assert rescaled[0]["duration"] < rescaled[1]["duration"] < rescaled[2]["duration"]
+
+def test_rescale_segments_keeps_durations_within_tolerance(text_processor):
+    """Test that durations close enough to the target are left as the model returned them."""
+    segments = [
+        {"text": "Intro", "topic": "Intro", "key_points": [], "duration": 20.5},
+        {"text": "Body", "topic": "Body", "key_points": [], "duration": 20.0},
+    ]
+    
+    rescaled = text_processor._rescale_segments(segments, 40.0)
+    
+    assert [segment["duration"] for segment in rescaled] == [20.5, 20.0]
+
+def test_stream_narration_stops_at_word_budget(text_processor):
+    """Test that streaming stops once the narration passes 1.2x the target word count."""
+    # 4 seconds at 150 words per minute is 10 words, so the budget is 12 words
+    sentence = "One two three four five. "
+    deltas = []
+    for _ in range(5):
+        deltas.extend(["One two ", "three four ", "five. "])
+    mock_stream = MagicMock()
+    mock_stream.__iter__.return_value = iter([_stream_chunk(delta) for delta in deltas])
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.return_value = mock_stream
+    
+    with patch('app.services.media.text_processor.get_openai_client', return_value=mock_client), \
+         patch('app.services.media.text_processor.get_cached_response', return_value=None), \
+         patch('app.services.media.text_processor.set_cached_response') as mock_set_cached:
+        narration = ''.join(text_processor._stream_narration("Some long post text.", 4.0))
+    
+    assert narration == sentence * 2
+    assert len(narration.split()) <= 4.0 * 1.2 * text_processor.SPEAKING_RATE / 60
+    mock_stream.close.assert_called_once()
+    mock_set_cached.assert_called_once()
+    assert mock_set_cached.call_args[0][1] == narration
+
+def test_stream_narration_yields_full_reply_under_budget(text_processor):
+    """Test that a narration within the word budget is streamed in full."""
+    mock_stream = MagicMock()
+    mock_stream.__iter__.return_value = iter([_stream_chunk("Short and "), _stream_chunk("sweet. Done")])
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.return_value = mock_stream
+    
+    with patch('app.services.media.text_processor.get_openai_client', return_value=mock_client), \
+         patch('app.services.media.text_processor.get_cached_response', return_value=None), \
+         patch('app.services.media.text_processor.set_cached_response'):
+        pieces = list(text_processor._stream_narration("Some post text.", 10.0))
+    
+    assert pieces == ["Short and sweet. ", "Done"]
+    mock_stream.close.assert_not_called()
+
+def test_truncate_to_duration(text_processor):
+    """Test that text slightly over the target drops trailing sentences and longer text is left to the model."""
+    sentence = "One two three four five."
+    
+    # 15 words is 6 seconds: within 20% of a 5 second target, which fits 12.5 words
+    assert text_processor._truncate_to_duration(' '.join([sentence] * 3), 5.0) == ' '.join([sentence] * 2)
+    assert text_processor._truncate_to_duration(' '.join([sentence] * 4), 5.0) is None
+
+def test_parse_segments_validates_fields(text_processor):
+    """Test that segment replies are accepted only with every field present and well-typed."""
+    valid = '{"segments": [{"text": "Intro.", "topic": "Intro", "key_points": ["hello"], "duration": 3}]}'
+    
+    assert text_processor._parse_segments(valid)[0]["duration"] == 3
+    with pytest.raises(ValueError):
+        text_processor._parse_segments('{"segments": [{"text": "Intro.", "topic": "Intro", "key_points": []}]}')
+    with pytest.raises(ValueError):
+        text_processor._parse_segments('{"segments": []}')
+    with pytest.raises(ValueError):
+        text_processor._parse_segments('not json')
+
+LONG_POST = "Our team shipped the new analytics dashboard after months of careful work with customers. " * 2
+
+def test_process_texts_uses_one_request(text_processor):
+    """Test that several texts are rewritten with a single OpenAI call and returned in order."""
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.return_value.choices[0].message.content = \
+        '{"0": "First narration.", "2": "Third narration."}'
+    items = [(LONG_POST + "#AI", 2.0), ("", 2.0), (LONG_POST, 2.0), ("Fourth " + LONG_POST, 2.0)]
+    
+    with patch('app.services.media.text_processor.get_openai_client', return_value=mock_client):
+        results = text_processor.process_texts(items)
+    
+    # Empty inputs come back as None and items the model left out as their cleaned text
+    assert results == ["First narration.", None, "Third narration.", ("Fourth " + LONG_POST).strip()]
+    mock_client.chat.completions.create.assert_called_once()
+    assert mock_client.chat.completions.create.call_args[1]["max_tokens"] == 3 * text_processor.BATCH_REPLY_TOKENS
+
+def test_process_texts_trims_near_fitting_texts_locally(text_processor):
+    """Test that texts only slightly over their target are trimmed without being sent to OpenAI."""
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.return_value.choices[0].message.content = '{"1": "Rewritten.", "2": "Rewritten."}'
+    sentence = "One two three four five."
+    items = [(' '.join([sentence] * 3), 5.0), (LONG_POST, 2.0), (LONG_POST, 3.0)]
+    
+    with patch('app.services.media.text_processor.get_openai_client', return_value=mock_client):
+        results = text_processor.process_texts(items)
+    
+    assert results == [' '.join([sentence] * 2), "Rewritten.", "Rewritten."]
+    sent_items = json.loads(mock_client.chat.completions.create.call_args[1]["messages"][1]["content"])
+    assert [item["id"] for item in sent_items] == ["1", "2"]
+
+def test_process_texts_groups_by_token_budget(text_processor):
+    """Test that texts are split across requests so each one stays within the token budget."""
+    def create(**request):
+        group = json.loads(request["messages"][1]["content"])
+        response = MagicMock()
+        response.choices[0].message.content = json.dumps({item["id"]: f"Narration {item['id']}." for item in group})
+        return response
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.side_effect = create
+    items = [(LONG_POST, 2.0)] * 5
+    
+    # Room for two texts per request
+    text_processor.BATCH_TOKEN_BUDGET = 2 * (text_processor.BATCH_REPLY_TOKENS + len(LONG_POST) // 2)
+    with patch('app.services.media.text_processor.get_openai_client', return_value=mock_client), \
+         patch.object(text_processor, 'process_text', return_value="Single narration.") as mock_process_text:
+        results = text_processor.process_texts(items)
+    
+    # The last text is left on its own and goes through process_text
+    assert results == ["Narration 0.", "Narration 1.", "Narration 2.", "Narration 3.", "Single narration."]
+    assert mock_client.chat.completions.create.call_count == 2
+    mock_process_text.assert_called_once_with(LONG_POST, 2.0)
+
+def test_map_reduce_text_summarizes_each_chunk(text_processor):
+    """Test that long text is split on sentence boundaries and each chunk summarized once."""
+    text_processor.CHUNK_WORDS = 10
+    text = ' '.join(f"Sentence number {i} has six words." for i in range(6))
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.return_value.choices[0].message.content = "Summary."
+    
+    chunks = text_processor._chunk_text(text)
+    with patch('app.services.media.text_processor.get_openai_client', return_value=mock_client):
+        summary = text_processor._map_reduce_text(text, 30.0)
+    
+    assert len(chunks) == 3
+    assert ' '.join(chunks) == text
+    assert summary == "Summary. Summary. Summary."
+    assert mock_client.chat.completions.create.call_count == 3